@@ -4,6 +4,10 @@ import warnings
 from enum import Enum
 from typing import TypeVar
 
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
 from allauth import app_settings as allauth_settings
 from allauth.core.internal.cryptokit import UserCodeFormat
 
@@ -34,6 +38,7 @@ class AppSettings:
 
     def __init__(self, prefix) -> None:
         self.prefix = prefix
+        self._rate_limits: dict | None = None
 
     def _setting(self, name: str, dflt: _T) -> _T:
         from allauth.utils import get_setting
@@ -266,7 +271,16 @@ class AppSettings:
 
     @property
     def RATE_LIMITS(self):
-        rls = self._setting("RATE_LIMITS", {})
+        # Consulted on every rate limited request. Unless settings are provided
+        # dynamically, memoize until settings change.
+        if hasattr(settings, "ALLAUTH_SETTING_GETTER"):
+            return self._get_rate_limits()
+        if self._rate_limits is None:
+            self._rate_limits = self._get_rate_limits()
+        return self._rate_limits
+
+    def _get_rate_limits(self) -> dict:
+        rls: dict = self._setting("RATE_LIMITS", {})
         if rls is False:
             return {}
         attempts_amount = self._setting("LOGIN_ATTEMPTS_LIMIT", 5)
@@ -636,6 +650,11 @@ class AppSettings:
 _app_settings = AppSettings("ACCOUNT_")
 
 
+@receiver(setting_changed)
+def _clear_rate_limits(**kwargs) -> None:
+    _app_settings._rate_limits = None
+
+
 def __getattr__(name):
     # See https://peps.python.org/pep-0562/
     return getattr(_app_settings, name)
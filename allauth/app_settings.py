@@ -75,6 +75,16 @@ class AppSettings:
         """
         return self._setting("TRUSTED_CLIENT_IP_HEADER", None)
 
+    @property
+    def RATE_LIMIT_BACKEND(self) -> str | None:
+        """
+        The backend used to keep track of rate limits: ``"redis"``,
+        ``"cache"``, ``"local"``, or the dotted path to a custom backend class.
+        By default, ``"redis"`` is used if the default cache is a Redis cache,
+        and ``"cache"`` otherwise.
+        """
+        return self._setting("RATE_LIMIT_BACKEND", None)
+
     @property
     def USER_CODE_FORMAT(self) -> UserCodeFormat:
         """
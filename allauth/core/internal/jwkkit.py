@@ -4,8 +4,11 @@ import hashlib
 import json
 
 import jwt
-from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
-from cryptography.hazmat.primitives.serialization import load_pem_private_key
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey, RSAPublicKey
+from cryptography.hazmat.primitives.serialization import (
+    load_pem_private_key,
+    load_pem_public_key,
+)
 from jwt.algorithms import RSAAlgorithm
 
 
@@ -40,9 +43,26 @@ def load_pem(pem: str) -> RSAPrivateKey:
     return private_key
 
 
-def load_jwk_from_pem(pem: str) -> tuple[dict, RSAPrivateKey]:
-    private_key = load_pem(pem)
-    public_key = private_key.public_key()
+def public_key_to_jwk(public_key: RSAPublicKey) -> dict:
     jwk_dict = json.loads(RSAAlgorithm.to_jwk(public_key))
     jwk_dict["kid"] = jwk_thumbprint(jwk_dict)
+    return jwk_dict
+
+
+def load_jwk_from_pem(pem: str) -> tuple[dict, RSAPrivateKey]:
+    private_key = load_pem(pem)
+    jwk_dict = public_key_to_jwk(private_key.public_key())
     return jwk_dict, private_key
+
+
+def load_public_jwk_from_pem(pem: str) -> tuple[dict, RSAPublicKey]:
+    """
+    Accepts both private and public key PEMs.
+    """
+    if "PRIVATE KEY" in pem:
+        jwk_dict, private_key = load_jwk_from_pem(pem)
+        return jwk_dict, private_key.public_key()
+    public_key = load_pem_public_key(pem.encode("utf8"))
+    if not isinstance(public_key, RSAPublicKey):
+        raise ValueError
+    return public_key_to_jwk(public_key), public_key
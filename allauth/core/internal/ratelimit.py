@@ -1,33 +1,68 @@
 """
-from __future__ import annotations
+Rate limiting is delegated to a backend (``ALLAUTH_RATE_LIMIT_BACKEND``):
+
+- ``"redis"``: an exact sliding window, evaluated atomically by means of a Lua
+  script. Requires the default cache to be a Redis cache.
+
+- ``"cache"``: a fixed window counter relying on the atomic ``cache.incr()``
+  offered by the Django cache backends for Redis, Memcached and local memory.
 
-Rate limiting in this implementation relies on a cache and uses non-atomic
-operations, making it vulnerable to race conditions. As a result, users may
-occasionally bypass the intended rate limit due to concurrent access. However,
-such race conditions are rare in practice. For example, if the limit is set to
-10 requests per minute and a large number of parallel processes attempt to test
-that limit, you may occasionally observe slight overruns—such as 11 or 12
-requests slipping through. Nevertheless, exceeding the limit by a large margin
-is highly unlikely due to the low probability of many processes entering the
-critical non-atomic code section simultaneously.
+- ``"local"``: an in-process sliding window, intended for testing.
+
+By default, the ``"redis"`` backend is used if the default cache is backed by
+Redis, and ``"cache"`` otherwise.
 """
 
+from __future__ import annotations
+
 import hashlib
+import math
+import secrets
+import threading
 import time
-from collections import namedtuple
 from dataclasses import dataclass
 from http import HTTPStatus
+from typing import NamedTuple
 
-from django.core.cache import cache
+from django.core.cache import DEFAULT_CACHE_ALIAS, caches
+from django.core.cache.backends.base import BaseCache
+from django.core.cache.backends.redis import RedisCache
 from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render
 from django.template.exceptions import TemplateDoesNotExist
 
+from allauth import app_settings as allauth_settings
 from allauth.core.exceptions import RateLimited
+from allauth.utils import import_attribute
+
+
+class Rate(NamedTuple):
+    amount: int
+    duration: int | float
+    per: str
+
+
+@dataclass(frozen=True)
+class RatePlan:
+    """
+    The parsed rates of an action, along with the prefix of their cache keys.
+    """
+
+    action: str
+    rates: tuple[Rate, ...]
+    cache_key_prefix: str
 
 
-Rate = namedtuple("Rate", "amount duration per")
+# Versioned, as the backends store values of a different type than the list of
+# timestamps stored under the previous ``allauth:rl:`` keys.
+CACHE_KEY_PREFIX = "allauth:rl2"
+
+# Keyed by (action, rates), so that plans never go stale, even when settings
+# are provided dynamically (``ALLAUTH_SETTING_GETTER``).
+_rate_plans: dict[tuple[str, str | None], RatePlan] = {}
 
 
 @dataclass
@@ -35,11 +70,12 @@ class SingleRateLimitUsage:
     cache_key: str
     cache_duration: float | int
     timestamp: float
+    # Backend specific reference to the consumed slot, empty for dry runs.
+    token: str = ""
 
     def rollback(self) -> None:
-        history = cache.get(self.cache_key, [])
-        history = [ts for ts in history if ts != self.timestamp]
-        cache.set(self.cache_key, history, self.cache_duration)
+        if self.token:
+            get_backend().rollback([self])
 
 
 @dataclass
@@ -47,8 +83,318 @@ class RateLimitUsage:
     usage: list[SingleRateLimitUsage]
 
     def rollback(self) -> None:
-        for usage in self.usage:
-            usage.rollback()
+        usages = [usage for usage in self.usage if usage.token]
+        if usages:
+            get_backend().rollback(usages)
+
+
+class RateLimitBackend:
+    """
+    Consumes all rates of an action in one go: either all of them are
+    consumed, or none at all.
+    """
+
+    def consume(
+        self, entries: list[tuple[str, Rate]], *, dry_run: bool = False
+    ) -> list[SingleRateLimitUsage] | None:
+        raise NotImplementedError
+
+    def rollback(self, usages: list[SingleRateLimitUsage]) -> None:
+        raise NotImplementedError
+
+    def clear(self, entries: list[tuple[str, Rate]]) -> None:
+        raise NotImplementedError
+
+
+class CacheBackend(RateLimitBackend):
+    """
+    Fixed window counters. The window starts at the first hit and expires
+    together with the cache entry. All counters are checked up front using a
+    single ``get_many()``, so that rejections cost only one round trip.
+
+    Django's generic ``incr()`` (used by e.g. the database cache) is neither
+    atomic nor does it retain the timeout, so for those caches the window is
+    aligned to the clock instead, and the counters are written using a single
+    ``set_many()``.
+    """
+
+    def _has_atomic_incr(self) -> bool:
+        return type(_get_cache()).incr is not BaseCache.incr
+
+    def _get_counter_key(self, cache_key: str, rate: Rate, now: float) -> str:
+        if self._has_atomic_incr():
+            return cache_key
+        window = int(now // rate.duration)
+        return f"{cache_key}:{window}"
+
+    def _incr(self, counter_key: str, rate: Rate, exists: bool) -> int:
+        cache = _get_cache()
+        if exists:
+            try:
+                return cache.incr(counter_key)
+            except ValueError:
+                pass
+        if cache.add(counter_key, 1, math.ceil(rate.duration)):
+            return 1
+        try:
+            return cache.incr(counter_key)
+        except ValueError:
+            # Expired in between.
+            return 1
+
+    def _decr(self, counter_key: str) -> None:
+        try:
+            _get_cache().decr(counter_key)
+        except ValueError:
+            pass
+
+    def consume(
+        self, entries: list[tuple[str, Rate]], *, dry_run: bool = False
+    ) -> list[SingleRateLimitUsage] | None:
+        cache = _get_cache()
+        now = time.time()
+        counter_keys = [
+            self._get_counter_key(cache_key, rate, now) for cache_key, rate in entries
+        ]
+        counts = cache.get_many(counter_keys)
+        for counter_key, (_, rate) in zip(counter_keys, entries):
+            if counts.get(counter_key, 0) >= rate.amount:
+                return None
+        if not dry_run:
+            if self._has_atomic_incr():
+                if not self._commit_atomic(counter_keys, entries, counts):
+                    return None
+            else:
+                self._commit(counter_keys, entries, counts)
+        return [
+            SingleRateLimitUsage(
+                cache_key=cache_key,
+                cache_duration=rate.duration,
+                timestamp=now,
+                token="" if dry_run else counter_key,
+            )
+            for counter_key, (cache_key, rate) in zip(counter_keys, entries)
+        ]
+
+    def _commit_atomic(
+        self,
+        counter_keys: list[str],
+        entries: list[tuple[str, Rate]],
+        counts: dict[str, int],
+    ) -> bool:
+        committed = []
+        for counter_key, (_, rate) in zip(counter_keys, entries):
+            count = self._incr(counter_key, rate, counter_key in counts)
+            committed.append(counter_key)
+            if count > rate.amount:
+                # Lost a race against a concurrent request, undo.
+                for committed_key in committed:
+                    self._decr(committed_key)
+                return False
+        return True
+
+    def _commit(
+        self,
+        counter_keys: list[str],
+        entries: list[tuple[str, Rate]],
+        counts: dict[str, int],
+    ) -> None:
+        values: dict[str, int] = {}
+        for counter_key in counter_keys:
+            values[counter_key] = (
+                values.get(counter_key, counts.get(counter_key, 0)) + 1
+            )
+        # The counter keys are window specific, so the longest window suffices.
+        timeout = max(math.ceil(rate.duration) for _, rate in entries)
+        _get_cache().set_many(values, timeout)
+
+    def rollback(self, usages: list[SingleRateLimitUsage]) -> None:
+        now = time.time()
+        atomic = self._has_atomic_incr()
+        for usage in usages:
+            if atomic:
+                # Once the window is gone, so is the usage.
+                if now - usage.timestamp < usage.cache_duration:
+                    self._decr(usage.token)
+                continue
+            # The generic decr() would reset the timeout to the default one,
+            # so the counter is written back expiring along with its window.
+            window = usage.timestamp // usage.cache_duration
+            timeout = math.ceil((window + 1) * usage.cache_duration - now)
+            if timeout > 0:
+                cache = _get_cache()
+                count = cache.get(usage.token)
+                if count:
+                    cache.set(usage.token, count - 1, timeout)
+
+    def clear(self, entries: list[tuple[str, Rate]]) -> None:
+        now = time.time()
+        _get_cache().delete_many(
+            [self._get_counter_key(cache_key, rate, now) for cache_key, rate in entries]
+        )
+
+
+class RedisBackend(RateLimitBackend):
+    """
+    Sliding windows, kept in sorted sets of timestamps, atomically evaluated
+    and updated by a Lua script in a single round trip.
+    """
+
+    SCRIPT = """
+local now = tonumber(ARGV[1])
+local member = ARGV[2]
+for i, key in ipairs(KEYS) do
+    local duration = tonumber(ARGV[1 + 2 * i])
+    local amount = tonumber(ARGV[2 + 2 * i])
+    redis.call("ZREMRANGEBYSCORE", key, "-inf", now - duration)
+    if redis.call("ZCARD", key) >= amount then
+        return 0
+    end
+end
+if member ~= "" then
+    for i, key in ipairs(KEYS) do
+        local duration = tonumber(ARGV[1 + 2 * i])
+        redis.call("ZADD", key, now, member)
+        redis.call("PEXPIRE", key, math.ceil(duration * 1000))
+    end
+end
+return 1
+"""
+
+    def __init__(self) -> None:
+        self._script = None
+
+    def _get_client(self):
+        cache = _get_cache()
+        if isinstance(cache, RedisCache):
+            return cache._cache.get_client(write=True)
+        # django-redis
+        return cache.client.get_client(write=True)
+
+    def consume(
+        self, entries: list[tuple[str, Rate]], *, dry_run: bool = False
+    ) -> list[SingleRateLimitUsage] | None:
+        cache = _get_cache()
+        client = self._get_client()
+        if self._script is None:
+            self._script = client.register_script(self.SCRIPT)
+        now = time.time()
+        member = "" if dry_run else f"{now}:{secrets.token_hex(4)}"
+        keys = []
+        args: list = [now, member]
+        for cache_key, rate in entries:
+            keys.append(cache.make_and_validate_key(cache_key))
+            args.extend([rate.duration, rate.amount])
+        allowed = self._script(  # type:ignore[misc]
+            keys=keys, args=args, client=client
+        )
+        if not allowed:
+            return None
+        return [
+            SingleRateLimitUsage(
+                cache_key=cache_key,
+                cache_duration=rate.duration,
+                timestamp=now,
+                token=member,
+            )
+            for cache_key, rate in entries
+        ]
+
+    def rollback(self, usages: list[SingleRateLimitUsage]) -> None:
+        cache = _get_cache()
+        pipeline = self._get_client().pipeline(transaction=False)
+        for usage in usages:
+            pipeline.zrem(cache.make_and_validate_key(usage.cache_key), usage.token)
+        pipeline.execute()
+
+    def clear(self, entries: list[tuple[str, Rate]]) -> None:
+        _get_cache().delete_many([cache_key for cache_key, rate in entries])
+
+
+class LocalBackend(RateLimitBackend):
+    """
+    Sliding windows, kept in process memory. Not shared across processes,
+    intended for testing purposes.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._history: dict[str, list[float]] = {}
+
+    def consume(
+        self, entries: list[tuple[str, Rate]], *, dry_run: bool = False
+    ) -> list[SingleRateLimitUsage] | None:
+        now = time.time()
+        with self._lock:
+            for cache_key, rate in entries:
+                history = [
+                    ts
+                    for ts in self._history.get(cache_key, [])
+                    if ts > now - rate.duration
+                ]
+                if history:
+                    self._history[cache_key] = history
+                else:
+                    self._history.pop(cache_key, None)
+                if len(history) >= rate.amount:
+                    return None
+            if not dry_run:
+                for cache_key, rate in entries:
+                    self._history.setdefault(cache_key, []).append(now)
+        return [
+            SingleRateLimitUsage(
+                cache_key=cache_key,
+                cache_duration=rate.duration,
+                timestamp=now,
+                token="" if dry_run else repr(now),
+            )
+            for cache_key, rate in entries
+        ]
+
+    def rollback(self, usages: list[SingleRateLimitUsage]) -> None:
+        with self._lock:
+            for usage in usages:
+                history = self._history.get(usage.cache_key, [])
+                if usage.timestamp in history:
+                    history.remove(usage.timestamp)
+
+    def clear(self, entries: list[tuple[str, Rate]]) -> None:
+        with self._lock:
+            for cache_key, rate in entries:
+                self._history.pop(cache_key, None)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._history.clear()
+
+
+BACKENDS: dict[str, type[RateLimitBackend]] = {
+    "cache": CacheBackend,
+    "redis": RedisBackend,
+    "local": LocalBackend,
+}
+_backends: dict[str, RateLimitBackend] = {}
+
+
+def _get_cache() -> BaseCache:
+    return caches[DEFAULT_CACHE_ALIAS]
+
+
+def _is_redis_cache(cache: BaseCache) -> bool:
+    return isinstance(cache, RedisCache) or type(cache).__module__.startswith(
+        "django_redis."
+    )
+
+
+def get_backend() -> RateLimitBackend:
+    path = allauth_settings.RATE_LIMIT_BACKEND
+    if path is None:
+        path = "redis" if _is_redis_cache(_get_cache()) else "cache"
+    backend = _backends.get(path)
+    if backend is None:
+        backend_class = BACKENDS.get(path) or import_attribute(path)
+        backend = _backends[path] = backend_class()
+    return backend
 
 
 def parse_duration(duration) -> int | float:
@@ -91,63 +437,73 @@ def parse_rates(rates: str | None) -> list[Rate]:
     return ret
 
 
-def get_cache_key(
-    request: HttpRequest, *, action: str, rate: Rate, key=None, user=None
+def get_rate_plan(config: dict, action: str) -> RatePlan:
+    rates = config.get(action)
+    plan = _rate_plans.get((action, rates))
+    if plan is None:
+        plan = RatePlan(
+            action=action,
+            rates=tuple(parse_rates(rates)),
+            cache_key_prefix=f"{CACHE_KEY_PREFIX}:{action}",
+        )
+        _rate_plans[(action, rates)] = plan
+    return plan
+
+
+@receiver(setting_changed)
+def _clear_rate_plans(**kwargs) -> None:
+    _rate_plans.clear()
+
+
+def _get_cache_key_source(
+    request: HttpRequest, *, per: str, key=None, user=None
 ) -> str:
     from allauth.account.adapter import get_adapter
 
-    source: tuple[str, ...]
-    if rate.per == "ip":
-        source = ("ip", get_adapter().get_client_ip(request))
-    elif rate.per == "user":
+    if per == "ip":
+        return f"ip:{get_adapter().get_client_ip(request)}"
+    elif per == "user":
         if user is None:
             if not request.user.is_authenticated:
                 raise ImproperlyConfigured(
                     "ratelimit configured per user but used anonymously"
                 )
             user = request.user
-        source = ("user", str(user.pk))
-    elif rate.per == "key":
+        return f"user:{user.pk}"
+    elif per == "key":
         if key is None:
             raise ImproperlyConfigured(
                 "ratelimit configured per key but no key specified"
             )
-        key_hash = hashlib.sha256(key.encode("utf8")).hexdigest()
-        source = (key_hash,)
-    else:
-        raise ValueError(rate.per)
-    keys = ["allauth", "rl", action, *source]
-    return ":".join(keys)
+        return hashlib.sha256(key.encode("utf8")).hexdigest()
+    raise ValueError(per)
 
 
-def _consume_single_rate(
-    request: HttpRequest,
-    *,
-    action: str,
-    rate: Rate,
-    key=None,
-    user=None,
-    dry_run: bool = False,
-    raise_exception: bool = False,
-) -> SingleRateLimitUsage | None:
-    cache_key = get_cache_key(request, action=action, rate=rate, key=key, user=user)
-    history = cache.get(cache_key, [])
-    now = time.time()
-    while history and history[-1] <= now - rate.duration:
-        history.pop()
-    allowed = len(history) < rate.amount
-    if allowed:
-        usage = SingleRateLimitUsage(
-            cache_key=cache_key, timestamp=now, cache_duration=rate.duration
-        )
-    else:
-        usage = None
-    if allowed and not dry_run:
-        history.insert(0, now)
-        cache.set(cache_key, history, rate.duration)
-    if not allowed and raise_exception:
-        raise RateLimited
-    return usage
+def get_cache_key(
+    request: HttpRequest, *, action: str, rate: Rate, key=None, user=None
+) -> str:
+    source = _get_cache_key_source(request, per=rate.per, key=key, user=user)
+    return f"{CACHE_KEY_PREFIX}:{action}:{source}"
+
+
+def _get_entries(
+    request: HttpRequest, plan: RatePlan, *, key=None, user=None
+) -> list[tuple[str, Rate]]:
+    entries: list[tuple[str, Rate]] = []
+    sources: dict[str, str] = {}
+    for rate in plan.rates:
+        source = sources.get(rate.per)
+        if source is None:
+            source = sources[rate.per] = _get_cache_key_source(
+                request, per=rate.per, key=key, user=user
+            )
+        cache_key = f"{plan.cache_key_prefix}:{source}"
+        if any(entry_key == cache_key for entry_key, _ in entries):
+            # Multiple rates of the same kind (e.g. "5/m/ip,20/h/ip") are
+            # not to share (and doubly consume) their entry.
+            cache_key = f"{cache_key}:{rate.duration}"
+        entries.append((cache_key, rate))
+    return entries
 
 
 def consume(
@@ -164,25 +520,17 @@ def consume(
     usage = RateLimitUsage(usage=[])
     if (not limit_get) and request.method == "GET":
         return usage
-    rates = parse_rates(config.get(action))
-    if not rates:
+    plan = get_rate_plan(config, action)
+    if not plan.rates:
         return usage
-    allowed = True
-    for rate in rates:
-        single_usage = _consume_single_rate(
-            request,
-            action=action,
-            rate=rate,
-            key=key,
-            user=user,
-            dry_run=dry_run,
-            raise_exception=raise_exception,
-        )
-        if not single_usage:
-            allowed = False
-            break
-        usage.usage.append(single_usage)
-    return usage if allowed else None
+    entries = _get_entries(request, plan, key=key, user=user)
+    usages = get_backend().consume(entries, dry_run=dry_run)
+    if usages is None:
+        if raise_exception:
+            raise RateLimited
+        return None
+    usage.usage.extend(usages)
+    return usage
 
 
 def handler429(request: HttpRequest) -> HttpResponse:
@@ -212,7 +560,7 @@ def handler429(request: HttpRequest) -> HttpResponse:
 def clear(
     request: HttpRequest, *, config: dict, action: str, key=None, user=None
 ) -> None:
-    rates = parse_rates(config.get(action))
-    for rate in rates:
-        cache_key = get_cache_key(request, action=action, rate=rate, key=key, user=user)
-        cache.delete(cache_key)
+    plan = get_rate_plan(config, action)
+    if not plan.rates:
+        return
+    get_backend().clear(_get_entries(request, plan, key=key, user=user))
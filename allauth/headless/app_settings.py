@@ -74,6 +74,18 @@ class AppSettings:
     def JWT_STATEFUL_VALIDATION_ENABLED(self) -> bool:
         return self._setting("JWT_STATEFUL_VALIDATION_ENABLED", False)
 
+    @property
+    def JWT_REVOCATION_CACHE_ALIAS(self) -> str | None:
+        return self._setting("JWT_REVOCATION_CACHE_ALIAS", None)
+
+    @property
+    def JWT_MAX_REFRESH_TOKENS(self) -> int | None:
+        return self._setting("JWT_MAX_REFRESH_TOKENS", 10)
+
+    @property
+    def JWT_REFRESH_TOKEN_CACHE_ALIAS(self) -> str | None:
+        return self._setting("JWT_REFRESH_TOKEN_CACHE_ALIAS", None)
+
     @property
     def JWT_ROTATE_REFRESH_TOKEN(self) -> bool:
         return self._setting("JWT_ROTATE_REFRESH_TOKEN", True)
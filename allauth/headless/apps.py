@@ -9,4 +9,17 @@ class HeadlessConfig(AppConfig):
     verbose_name = _("Headless")
 
     def ready(self) -> None:
+        from django.contrib.auth.signals import user_logged_out
+
+        from allauth import app_settings as allauth_settings
+        from allauth.account.signals import password_changed, password_reset
         from allauth.headless import checks  # noqa
+        from allauth.headless.internal import revocationkit
+
+        user_logged_out.connect(receiver=revocationkit.on_user_logged_out)
+        for sig in [password_changed, password_reset]:
+            sig.connect(receiver=revocationkit.on_password_changed)
+        if allauth_settings.USERSESSIONS_ENABLED:
+            from allauth.usersessions.signals import session_ended
+
+            session_ended.connect(receiver=revocationkit.on_session_ended)
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import hashlib
 from collections.abc import Callable
 from typing import Any
 
 from django.http import HttpRequest, HttpResponse, HttpResponseBase
+from django.utils.cache import get_conditional_response
 from django.utils.decorators import classonlymethod
+from django.utils.http import quote_etag
 
 from allauth.account.stages import LoginStage, LoginStageController
 from allauth.core.exceptions import ReauthenticationRequired
@@ -69,4 +72,10 @@ class ConfigView(APIView):
         The frontend queries (GET) this endpoint, expecting to receive
         either a 401 if no user is authenticated, or user information.
         """
-        return response.ConfigResponse(request)
+        resp = response.ConfigResponse(request)
+        # Allow the frontend to revalidate the configuration, instead of
+        # downloading it over and over again.
+        etag = quote_etag(hashlib.sha256(resp.content).hexdigest())
+        resp["ETag"] = etag
+        resp["Cache-Control"] = "private, no-cache"
+        return get_conditional_response(request, etag=etag, response=resp) or resp
@@ -0,0 +1,104 @@
+"""
+Keeps track of revoked JWT access tokens, so that, without stateful
+validation, tokens can be rejected before they expire. Revocations are stored
+in the cache (``HEADLESS_JWT_REVOCATION_CACHE_ALIAS``), and only need to be
+kept for as long as an access token lives
+(``HEADLESS_JWT_ACCESS_TOKEN_EXPIRES_IN``).
+
+Two kinds of revocations are recorded:
+
+- Sessions (e.g. on logout): all access tokens belonging to the session are
+  revoked.
+- Users (e.g. on password change): all access tokens of the user that were
+  issued before the revocation are revoked. Note that changing the password
+  cycles the session key, so this includes the tokens of the current session,
+  just like with stateful validation.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Any
+
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.core.cache import BaseCache, caches
+
+from allauth.account.internal.userkit import user_id_to_str
+from allauth.headless import app_settings
+
+
+def _get_cache() -> BaseCache | None:
+    alias = app_settings.JWT_REVOCATION_CACHE_ALIAS
+    if not alias:
+        return None
+    return caches[alias]
+
+
+def _digest(session_key: str) -> str:
+    # Session keys are secrets, so they are not to end up in the cache as is.
+    return hashlib.sha256(session_key.encode("utf8")).hexdigest()
+
+
+def _session_cache_key(session_key: str) -> str:
+    return f"allauth.headless.revoked.session.{_digest(session_key)}"
+
+
+def _user_cache_key(sub: str) -> str:
+    return f"allauth.headless.revoked.user.{sub}"
+
+
+def is_enabled() -> bool:
+    return bool(app_settings.JWT_REVOCATION_CACHE_ALIAS)
+
+
+def revoke_session(session_key: str) -> None:
+    cache = _get_cache()
+    if cache is None:
+        return
+    cache.set(
+        _session_cache_key(session_key),
+        True,
+        timeout=app_settings.JWT_ACCESS_TOKEN_EXPIRES_IN,
+    )
+
+
+def revoke_user(user: AbstractBaseUser) -> None:
+    cache = _get_cache()
+    if cache is None:
+        return
+    cache.set(
+        _user_cache_key(user_id_to_str(user)),
+        # Access tokens carry a whole second as "iat", so only tokens issued
+        # before the second of revocation can be told apart as revoked.
+        int(time.time()),
+        timeout=app_settings.JWT_ACCESS_TOKEN_EXPIRES_IN,
+    )
+
+
+def is_revoked(payload: dict[str, Any], session_key: str) -> bool:
+    cache = _get_cache()
+    if cache is None:
+        return False
+    session_cache_key = _session_cache_key(session_key)
+    user_cache_key = _user_cache_key(payload["sub"])
+    revocations = cache.get_many([session_cache_key, user_cache_key])
+    if revocations.get(session_cache_key):
+        return True
+    revoked_at = revocations.get(user_cache_key)
+    return revoked_at is not None and payload.get("iat", 0) < revoked_at
+
+
+def on_user_logged_out(sender, **kwargs) -> None:
+    request = kwargs.get("request")
+    session_key = request.session.session_key if request else None
+    if session_key:
+        revoke_session(session_key)
+
+
+def on_password_changed(sender, **kwargs) -> None:
+    revoke_user(kwargs["user"])
+
+
+def on_session_ended(sender, **kwargs) -> None:
+    revoke_session(kwargs["session"].session_key)
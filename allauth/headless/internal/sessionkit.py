@@ -50,6 +50,15 @@ def authenticate_by_x_session_token(token: str) -> tuple | None:
 
 
 def lookup_session(session_key: str) -> SessionBase | None:
-    if session_store().exists(session_key):
-        return session_store(session_key)
-    return None
+    """
+    Loads the session once, instead of checking ``exists()`` up front and
+    loading it afterwards. The session engines reset (or, in case of an
+    expired file based session, replace) the session key of a session that
+    does not exist, which is how its absence is detected.
+    """
+    session = session_store(session_key)
+    # Accessing the session data is what triggers the load.
+    session.keys()
+    if session.session_key != session_key:
+        return None
+    return session
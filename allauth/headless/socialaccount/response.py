@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import copy
+from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 from django.http import HttpRequest
@@ -8,7 +10,11 @@ from allauth.headless.account.response import email_address_data
 from allauth.headless.adapter import get_adapter
 from allauth.headless.base.response import APIResponse
 from allauth.headless.constants import Client, Flow
-from allauth.socialaccount.adapter import get_adapter as get_socialaccount_adapter
+from allauth.socialaccount.adapter import (
+    DefaultSocialAccountAdapter,
+    get_adapter as get_socialaccount_adapter,
+)
+from allauth.socialaccount.internal import appkit
 from allauth.socialaccount.internal.flows import signup
 from allauth.socialaccount.providers.oauth2.provider import OAuth2Provider
 
@@ -41,24 +47,20 @@ def _provider_data(request: HttpRequest, provider) -> dict:
 
 def provider_flows(request: HttpRequest) -> list:
     flows = []
-    providers = _list_supported_providers(request)
-    if providers:
-        redirect_providers = [p.sub_id for p in providers if p.supports_redirect]
-        token_providers = [
-            p.sub_id for p in providers if p.supports_token_authentication
-        ]
-        if redirect_providers and request.allauth.headless.client == Client.BROWSER:  # type: ignore[attr-defined]
+    metadata = _get_provider_metadata(request)
+    if metadata.providers:
+        if metadata.redirect_providers and request.allauth.headless.client == Client.BROWSER:  # type: ignore[attr-defined]
             flows.append(
                 {
                     "id": Flow.PROVIDER_REDIRECT,
-                    "providers": redirect_providers,
+                    "providers": list(metadata.redirect_providers),
                 }
             )
-        if token_providers:
+        if metadata.token_providers:
             flows.append(
                 {
                     "id": Flow.PROVIDER_TOKEN,
-                    "providers": token_providers,
+                    "providers": list(metadata.token_providers),
                 }
             )
         sociallogin = signup.get_pending_signup(request)
@@ -96,14 +98,48 @@ def _list_supported_providers(request: HttpRequest) -> list:
     return providers
 
 
+@dataclass(frozen=True)
+class ProviderMetadata:
+    # The provider data, sorted by name.
+    providers: list[dict]
+    redirect_providers: list[str]
+    token_providers: list[str]
+
+
+def _get_provider_metadata(request: HttpRequest) -> ProviderMetadata:
+    """
+    Listing the providers involves instantiating each one of them, which is
+    wasteful for something that is needed on every (unauthenticated) session
+    and config request. Hence, the metadata is memoized along with the apps,
+    unless the adapter decides which providers are available by itself.
+    """
+    client = request.allauth.headless.client  # type: ignore[attr-defined]
+
+    def compute() -> ProviderMetadata:
+        providers = _list_supported_providers(request)
+        return ProviderMetadata(
+            providers=[
+                _provider_data(request, provider)
+                for provider in sorted(providers, key=lambda p: p.name)
+            ],
+            redirect_providers=[p.sub_id for p in providers if p.supports_redirect],
+            token_providers=[
+                p.sub_id for p in providers if p.supports_token_authentication
+            ],
+        )
+
+    adapter_class = type(get_socialaccount_adapter())
+    if (
+        adapter_class.list_providers is not DefaultSocialAccountAdapter.list_providers
+        or adapter_class.list_apps is not DefaultSocialAccountAdapter.list_apps
+    ):
+        return compute()
+    return appkit.get_registry(request).memoize(("headless", client), compute)
+
+
 def get_config_data(request: HttpRequest) -> dict:
-    entries: list[dict] = []
-    data = {"socialaccount": {"providers": entries}}
-    providers = _list_supported_providers(request)
-    providers = sorted(providers, key=lambda p: p.name)
-    for provider in providers:
-        entries.append(_provider_data(request, provider))
-    return data
+    metadata = _get_provider_metadata(request)
+    return {"socialaccount": {"providers": copy.deepcopy(metadata.providers)}}
 
 
 class SocialAccountsResponse(APIResponse):
@@ -13,6 +13,9 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.base_user import AbstractBaseUser
 from django.contrib.sessions.backends.base import SessionBase
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.utils.functional import SimpleLazyObject
 
 import jwt
@@ -22,6 +25,7 @@ from allauth.account.internal.userkit import str_to_user_id, user_id_to_str
 from allauth.core.internal import jwkkit
 from allauth.core.internal.sessionkit import get_session_user
 from allauth.headless import app_settings
+from allauth.headless.internal import revocationkit
 from allauth.headless.internal.sessionkit import lookup_session
 
 
@@ -41,6 +45,10 @@ def validate_access_token(token: str) -> tuple[Any, dict[str, Any]] | None:
         session = get_token_session(payload)
         if session is None:
             return None
+    elif revocationkit.is_enabled():
+        session_key = session_key_from_sid(payload["sid"])
+        if not session_key or revocationkit.is_revoked(payload, session_key):
+            return None
     sub = payload["sub"]
     pk = str_to_user_id(sub)
     lazy_user = SimpleLazyObject(lambda: get_user_model().objects.get(pk=pk))
@@ -133,15 +141,38 @@ def get_token_session(payload: dict[str, Any]) -> SessionBase | None:
     return session
 
 
+# Loading (RSA) key material is expensive, and required for every token that
+# is created or decoded. Keyed by the (algorithm, key) so that a changed key
+# is picked up right away.
+_jwt_configs: dict[tuple[str, str], JWTConfig] = {}
+
+
+@receiver(setting_changed)
+def _clear_jwt_configs(**kwargs) -> None:
+    _jwt_configs.clear()
+
+
 def _get_jwt_config() -> JWTConfig:
     algorithm = app_settings.JWT_ALGORITHM
-    jwk_dict = None
     if algorithm.startswith("HS"):
         key = app_settings.JWT_PRIVATE_KEY or settings.SECRET_KEY
+    else:
+        key = app_settings.JWT_PRIVATE_KEY
+    config = _jwt_configs.get((algorithm, key))
+    if config is None:
+        config = _load_jwt_config(algorithm, key)
+        _jwt_configs[(algorithm, key)] = config
+    return config
+
+
+def _load_jwt_config(algorithm: str, key: str) -> JWTConfig:
+    jwk_dict = None
+    signing_key: Any
+    if algorithm.startswith("HS"):
         signing_key = key
         verifying_key = key
     elif algorithm.startswith("RS"):
-        jwk_dict, signing_key = jwkkit.load_jwk_from_pem(app_settings.JWT_PRIVATE_KEY)
+        jwk_dict, signing_key = jwkkit.load_jwk_from_pem(key)
         verifying_key = signing_key.public_key()
     else:
         raise ValueError(f"Unsupported JWT algorithm: {algorithm}")
@@ -223,8 +254,59 @@ def create_token(
     )
 
 
+REFRESH_TOKEN_STATE_SESSION_KEY = "headless_refresh_tokens"  # nosec
+
+
+def _refresh_token_state_cache_key(session: SessionBase) -> str:
+    assert session.session_key  # nosec
+    # Session keys are secrets, so they are not to end up in the cache as is.
+    digest = hashlib.sha256(session.session_key.encode("utf8")).hexdigest()
+    return f"allauth.headless.refresh_tokens.{digest}"
+
+
 def get_refresh_token_state(session: SessionBase) -> dict[str, int]:
-    return session.setdefault("headless_refresh_tokens", {})
+    """
+    Returns the refresh tokens that were handed out for the session, as a
+    mapping of their ``jti`` to their expiration time. The state is either
+    kept in the session itself, or, when
+    ``HEADLESS_JWT_REFRESH_TOKEN_CACHE_ALIAS`` is set, in the cache.
+    """
+    alias = app_settings.JWT_REFRESH_TOKEN_CACHE_ALIAS
+    if alias:
+        state = caches[alias].get(_refresh_token_state_cache_key(session))
+    else:
+        state = session.get(REFRESH_TOKEN_STATE_SESSION_KEY)
+    return dict(state) if state else {}
+
+
+def save_refresh_token_state(session: SessionBase, state: dict[str, int]) -> None:
+    alias = app_settings.JWT_REFRESH_TOKEN_CACHE_ALIAS
+    if alias:
+        caches[alias].set(
+            _refresh_token_state_cache_key(session),
+            state,
+            timeout=app_settings.JWT_REFRESH_TOKEN_EXPIRES_IN,
+        )
+    elif state:
+        session[REFRESH_TOKEN_STATE_SESSION_KEY] = state
+    else:
+        session.pop(REFRESH_TOKEN_STATE_SESSION_KEY, None)
+
+
+def prune_refresh_token_state(state: dict[str, int]) -> dict[str, int]:
+    """
+    Drops the expired refresh tokens, as well as the oldest ones in excess of
+    ``HEADLESS_JWT_MAX_REFRESH_TOKENS``.
+    """
+    now = time.time()
+    jti_exps = sorted(
+        ((jti, exp) for jti, exp in state.items() if exp > now),
+        key=lambda jti_exp: jti_exp[1],
+    )
+    max_tokens = app_settings.JWT_MAX_REFRESH_TOKENS
+    if max_tokens:
+        jti_exps = jti_exps[-max_tokens:]
+    return dict(jti_exps)
 
 
 def create_refresh_token(user: AbstractBaseUser, session: SessionBase) -> str:
@@ -240,6 +322,9 @@ def create_refresh_token(user: AbstractBaseUser, session: SessionBase) -> str:
     )
     refresh_token_jti_to_exp = get_refresh_token_state(session)
     refresh_token_jti_to_exp[payload["jti"]] = payload["exp"]
+    save_refresh_token_state(
+        session, prune_refresh_token_state(refresh_token_jti_to_exp)
+    )
     return token
 
 
@@ -262,4 +347,7 @@ def create_access_token(
 def invalidate_refresh_token(session: SessionBase, token: dict[str, Any]) -> None:
     refresh_token_jti_to_exp = get_refresh_token_state(session)
     jti = token["jti"]
-    refresh_token_jti_to_exp.pop(jti, None)
+    if refresh_token_jti_to_exp.pop(jti, None) is not None:
+        save_refresh_token_state(
+            session, prune_refresh_token_state(refresh_token_jti_to_exp)
+        )
@@ -32,10 +32,18 @@ class JWTTokenStrategy(AbstractTokenStrategy):
         )
         if access_token is None:
             return None
+        # The access token is needed more than once while handling a request,
+        # yet, it only needs to be validated once.
+        validated = getattr(request, "_headless_access_token", None)
+        if validated and validated[0] == access_token:
+            return validated[1]
         user_payload = internal.validate_access_token(access_token)
-        if user_payload is None:
-            return None
-        return user_payload[1]
+        payload = user_payload[1] if user_payload else None
+        request._headless_access_token = (  # type:ignore[attr-defined]
+            access_token,
+            payload,
+        )
+        return payload
 
     def create_session_token(self, request: HttpRequest) -> str:
         if not request.session.session_key:
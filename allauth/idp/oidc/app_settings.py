@@ -33,10 +33,30 @@ class AppSettings:
     def PRIVATE_KEY(self) -> str:
         return self._setting("PRIVATE_KEY", "")
 
+    @property
+    def VERIFICATION_KEYS(self) -> list[str]:
+        """
+        Keys (PEM) that are published, and accepted when verifying tokens, but
+        not used for signing. Used for key rotation.
+        """
+        return self._setting("VERIFICATION_KEYS", [])
+
     @property
     def ACCESS_TOKEN_EXPIRES_IN(self) -> int:
         return self._setting("ACCESS_TOKEN_EXPIRES_IN", 3600)
 
+    @property
+    def ACCESS_TOKEN_CACHE_ALIAS(self) -> str | None:
+        return self._setting("ACCESS_TOKEN_CACHE_ALIAS", None)
+
+    @property
+    def ACCESS_TOKEN_CACHE_MAX_AGE(self) -> int:
+        return self._setting("ACCESS_TOKEN_CACHE_MAX_AGE", 60)
+
+    @property
+    def ACCESS_TOKEN_LOCAL_VALIDATION_ENABLED(self) -> bool:
+        return self._setting("ACCESS_TOKEN_LOCAL_VALIDATION_ENABLED", False)
+
     @property
     def ACCESS_TOKEN_FORMAT(self) -> str:
         return self._setting("ACCESS_TOKEN_FORMAT", "opaque")
@@ -86,6 +106,14 @@ class AppSettings:
         """
         return self._setting("RP_INITIATED_LOGOUT_ASKS_FOR_OP_LOGOUT", True)
 
+    @property
+    def TOKEN_PURGE_INTERVAL(self) -> int | None:
+        """
+        When set, expired tokens are purged (one batch at a time) while
+        issuing tokens, at most once per this many seconds.
+        """
+        return self._setting("TOKEN_PURGE_INTERVAL", None)
+
     @property
     def USERINFO_ENDPOINT(self) -> str | None:
         """
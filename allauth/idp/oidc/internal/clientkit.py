@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
 from re import Pattern
 from urllib.parse import ParseResult, parse_qsl, urlparse
 
@@ -47,83 +48,118 @@ def _wildcard_to_regex(wildcard: str) -> Pattern:
     return re.compile(f"^{pattern}$")
 
 
-def _is_scheme_hostname_allowed(
-    parsed_uri: ParseResult, parsed_allowed_uri: ParseResult, allow_uri_wildcards: bool
-) -> bool:
-    if parsed_allowed_uri.scheme != parsed_uri.scheme:
-        return False
+class _AllowedURI:
+    def __init__(self, uri: str, allow_uri_wildcards: bool) -> None:
+        self.parsed = urlparse(uri)
+        self.hostname_pattern: Pattern | None = None
+        hostname = self.parsed.hostname
+        if allow_uri_wildcards and hostname and "*" in hostname:
+            self.hostname_pattern = _wildcard_to_regex(hostname)
+        self.query = frozenset(parse_qsl(self.parsed.query))
 
-    if (
-        allow_uri_wildcards
-        and parsed_allowed_uri.hostname
-        and "*" in parsed_allowed_uri.hostname
-    ):
-        allowed_hostname_pattern = _wildcard_to_regex(parsed_allowed_uri.hostname)
-
-        if not allowed_hostname_pattern.match(parsed_uri.hostname):
-            return False
-    else:
-        if parsed_allowed_uri.hostname != parsed_uri.hostname:
+    def is_scheme_hostname_allowed(self, parsed_uri: ParseResult) -> bool:
+        if self.parsed.scheme != parsed_uri.scheme:
             return False
+        if self.hostname_pattern:
+            return bool(
+                parsed_uri.hostname and self.hostname_pattern.match(parsed_uri.hostname)
+            )
+        return self.parsed.hostname == parsed_uri.hostname
 
-    return True
 
+class URIMatcher:
+    """
+    Matches URIs against a list of allowed URIs, which are parsed (and, for
+    wildcard hostnames, compiled) once, up front.
+    """
 
-def is_parsed_redirect_uri_allowed(
-    parsed_uri: ParseResult, allowed_uri: str, allow_uri_wildcards: bool
-) -> bool:
-    parsed_allowed_uri = urlparse(allowed_uri)
+    def __init__(self, allowed_uris: tuple[str, ...], allow_uri_wildcards: bool):
+        self.exact = frozenset(allowed_uris)
+        self.allowed = [_AllowedURI(uri, allow_uri_wildcards) for uri in allowed_uris]
+        self.hostnames = frozenset(
+            allowed.parsed.hostname
+            for allowed in self.allowed
+            if not allowed.hostname_pattern
+        )
+        wildcard_patterns = [
+            allowed.hostname_pattern.pattern
+            for allowed in self.allowed
+            if allowed.hostname_pattern
+        ]
+        self.wildcard_hostnames: Pattern | None = None
+        if wildcard_patterns:
+            self.wildcard_hostnames = re.compile(
+                "|".join(f"(?:{pattern})" for pattern in wildcard_patterns)
+            )
 
-    if not _is_scheme_hostname_allowed(
-        parsed_uri, parsed_allowed_uri, allow_uri_wildcards
-    ):
-        return False
+    def _candidates(self, parsed_uri: ParseResult) -> list[_AllowedURI]:
+        hostname = parsed_uri.hostname
+        if hostname in self.hostnames:
+            return self.allowed
+        if (
+            hostname
+            and self.wildcard_hostnames
+            and self.wildcard_hostnames.match(hostname)
+        ):
+            return self.allowed
+        return []
 
-    if parsed_allowed_uri.path != parsed_uri.path:
+    def is_redirect_uri_allowed(self, uri: str) -> bool:
+        if uri in self.exact:
+            return True
+        parsed_uri = urlparse(uri)
+        query: frozenset | None = None
+        for allowed in self._candidates(parsed_uri):
+            if not allowed.is_scheme_hostname_allowed(parsed_uri):
+                continue
+            if allowed.parsed.path != parsed_uri.path:
+                continue
+            if not is_loopback(allowed.parsed):
+                if allowed.parsed.port != parsed_uri.port:
+                    continue
+            if query is None:
+                query = frozenset(parse_qsl(parsed_uri.query))
+            if not allowed.query.issubset(query):
+                continue
+            return True
         return False
 
-    if not is_loopback(parsed_allowed_uri):
-        if parsed_allowed_uri.port != parsed_uri.port:
-            return False
-
-    if not set(parse_qsl(parsed_allowed_uri.query)).issubset(
-        set(parse_qsl(parsed_uri.query))
-    ):
+    def is_origin_allowed(self, origin: str) -> bool:
+        parsed_origin = urlparse(origin)
+        for allowed in self._candidates(parsed_origin):
+            if (
+                allowed.is_scheme_hostname_allowed(parsed_origin)
+                and parsed_origin.username == allowed.parsed.username
+                and parsed_origin.password == allowed.parsed.password
+                and parsed_origin.port == allowed.parsed.port
+            ):
+                return True
         return False
 
-    return True
+
+@lru_cache(maxsize=256)
+def get_uri_matcher(
+    allowed_uris: tuple[str, ...], allow_uri_wildcards: bool
+) -> URIMatcher:
+    """
+    The matchers are memoized by the allowed URIs themselves, so that a change
+    to a client results in a new matcher, in all processes alike.
+    """
+    return URIMatcher(allowed_uris, allow_uri_wildcards)
 
 
 def is_redirect_uri_allowed(
     uri: str, allowed_uris: list[str], allow_uri_wildcards: bool
 ) -> bool:
-    parsed_uri = urlparse(uri)
-    return any(
-        is_parsed_redirect_uri_allowed(parsed_uri, allowed_uri, allow_uri_wildcards)
-        for allowed_uri in allowed_uris
-    )
+    matcher = get_uri_matcher(tuple(allowed_uris), allow_uri_wildcards)
+    return matcher.is_redirect_uri_allowed(uri)
 
 
 def is_origin_allowed(
     origin: str, allowed_origins: list[str], allow_uri_wildcards: bool
 ) -> bool:
-    parsed_origin = urlparse(origin)
-
-    for allowed_origin in allowed_origins:
-        parsed_allowed_origin = urlparse(allowed_origin)
-        if (
-            not _is_scheme_hostname_allowed(
-                parsed_origin, parsed_allowed_origin, allow_uri_wildcards
-            )
-            or parsed_origin.username != parsed_allowed_origin.username
-            or parsed_origin.password != parsed_allowed_origin.password
-            or parsed_origin.port != parsed_allowed_origin.port
-        ):
-            continue
-        else:
-            return True
-
-    return False
+    matcher = get_uri_matcher(tuple(allowed_origins), allow_uri_wildcards)
+    return matcher.is_origin_allowed(origin)
 
 
 def get_used_schemes(client: Client) -> set[str]:
@@ -3,6 +3,7 @@ from __future__ import annotations
 from django.http import HttpRequest
 
 from allauth.account.internal.flows.logout import logout
+from allauth.idp.oidc.internal.oauthlib import access_tokens
 from allauth.idp.oidc.models import Client, Token
 
 
@@ -16,11 +17,16 @@ def rp_initiated_logout(
     if not request.user.is_authenticated:
         return
     if client:
-        Token.objects.filter(
+        tokens = Token.objects.filter(
             user=request.user,
             client=client,
             type__in=[Token.Type.ACCESS_TOKEN, Token.Type.REFRESH_TOKEN],
-        ).delete()
+        )
+        access_token_hashes = list(
+            tokens.filter(type=Token.Type.ACCESS_TOKEN).values_list("hash", flat=True)
+        )
+        tokens.delete()
+        access_tokens.invalidate(access_token_hashes)
     if from_op:
         has_redirect_uri = bool(post_logout_redirect_uri)
         logout(request, show_message=not has_redirect_uri)
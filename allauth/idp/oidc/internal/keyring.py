@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey, RSAPublicKey
+
+from allauth.core.internal import jwkkit
+from allauth.idp.oidc import app_settings
+
+
+@dataclass(frozen=True)
+class Key:
+    kid: str
+    jwk: dict
+    public_key: RSAPublicKey
+
+
+@dataclass(frozen=True)
+class Keyring:
+    """
+    The active signing key, along with the keys that are only used for
+    verification, e.g. keys that were recently rotated out, or keys that are
+    about to be rotated in.
+    """
+
+    signing_key: Key
+    private_key: RSAPrivateKey
+    keys: dict[str, Key]
+    jwks: bytes
+    jwks_etag: str
+
+    def sign(self, payload: dict) -> str:
+        return jwt.encode(
+            payload,
+            self.private_key,
+            algorithm="RS256",
+            headers={"kid": self.signing_key.kid},
+        )
+
+    def get_verifying_key(self, kid: str | None) -> Key | None:
+        if kid is None:
+            return self.signing_key
+        return self.keys.get(kid)
+
+
+# Keyed by the key settings, so that a rotation is picked up right away.
+_keyrings: dict[tuple[str, tuple[str, ...]], Keyring] = {}
+
+
+@receiver(setting_changed)
+def _clear_keyrings(**kwargs) -> None:
+    _keyrings.clear()
+
+
+def get_keyring() -> Keyring:
+    private_key = app_settings.PRIVATE_KEY
+    verification_keys = tuple(app_settings.VERIFICATION_KEYS)
+    keyring = _keyrings.get((private_key, verification_keys))
+    if keyring is None:
+        keyring = load_keyring(private_key, verification_keys)
+        _keyrings[(private_key, verification_keys)] = keyring
+    return keyring
+
+
+def load_keyring(private_key: str, verification_keys: tuple[str, ...]) -> Keyring:
+    jwk_dict, private_key_obj = jwkkit.load_jwk_from_pem(private_key)
+    signing_key = Key(
+        kid=jwk_dict["kid"], jwk=jwk_dict, public_key=private_key_obj.public_key()
+    )
+    keys = {signing_key.kid: signing_key}
+    for pem in verification_keys:
+        jwk_dict, public_key = jwkkit.load_public_jwk_from_pem(pem)
+        keys.setdefault(
+            jwk_dict["kid"],
+            Key(kid=jwk_dict["kid"], jwk=jwk_dict, public_key=public_key),
+        )
+    jwks = json.dumps({"keys": [key.jwk for key in keys.values()]}).encode()
+    return Keyring(
+        signing_key=signing_key,
+        private_key=private_key_obj,
+        keys=keys,
+        jwks=jwks,
+        jwks_etag=hashlib.sha256(jwks).hexdigest(),
+    )
@@ -0,0 +1,117 @@
+"""
+Resource servers validate access tokens far more often than tokens are
+issued. When ``IDP_OIDC_ACCESS_TOKEN_CACHE_ALIAS`` is set, validated access
+tokens (along with their user and client) are cached by their hash, for at
+most ``IDP_OIDC_ACCESS_TOKEN_CACHE_MAX_AGE`` seconds. Revoked access tokens
+are remembered in that same cache, for as long as access tokens live.
+
+JWT access tokens can, alternatively, be validated locally
+(``IDP_OIDC_ACCESS_TOKEN_LOCAL_VALIDATION_ENABLED``), without consulting the
+database at all.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone as dt_timezone
+from typing import Iterable
+
+from django.core.cache import BaseCache, caches
+from django.utils import timezone
+
+from allauth.idp.oidc import app_settings
+from allauth.idp.oidc.adapter import get_adapter
+from allauth.idp.oidc.models import Token
+
+
+REVOKED = "revoked"
+
+
+def _get_cache() -> BaseCache | None:
+    # Note that the revocation markers are kept regardless of
+    # ``ACCESS_TOKEN_CACHE_MAX_AGE``, which only concerns validated tokens.
+    alias = app_settings.ACCESS_TOKEN_CACHE_ALIAS
+    if not alias:
+        return None
+    return caches[alias]
+
+
+def cache_key(token_hash: str) -> str:
+    return f"allauth.idp.oidc.access_token[{token_hash}]"
+
+
+def lookup(value: str) -> Token | None:
+    token_hash = get_adapter().hash_token(value)
+    cache = _get_cache()
+    if cache is not None:
+        instance = cache.get(cache_key(token_hash))
+        if instance == REVOKED:
+            return None
+        if instance is not None:
+            if instance.expires_at and instance.expires_at <= timezone.now():
+                return None
+            return instance
+    instance = (
+        Token.objects.valid()
+        .select_related("user", "client")
+        .filter(type=Token.Type.ACCESS_TOKEN, hash=token_hash)
+        .first()
+    )
+    if instance is not None and cache is not None:
+        timeout = app_settings.ACCESS_TOKEN_CACHE_MAX_AGE
+        if instance.expires_at:
+            expires_in = (instance.expires_at - timezone.now()).total_seconds()
+            timeout = min(timeout, int(expires_in))
+        if timeout > 0:
+            _cache_set(cache, cache_key(token_hash), instance, timeout)
+    return instance
+
+
+def _cache_set(cache: BaseCache, key: str, instance: Token, timeout: int) -> None:
+    # Neither the password hash of the user, nor the hashed secret of the
+    # client is to end up in the cache. Leaving them out turns them into
+    # deferred fields, loaded only when accessed.
+    stripped = []
+    for obj, field in [(instance.user, "password"), (instance.client, "secret")]:
+        if obj is not None and field in obj.__dict__:
+            stripped.append((obj, field, obj.__dict__.pop(field)))
+    try:
+        cache.set(key, instance, timeout=timeout)
+    finally:
+        for obj, field, value in stripped:
+            obj.__dict__[field] = value
+
+
+def from_payload(value: str, payload: dict) -> Token | None:
+    """
+    Given a JWT access token that was validated locally (signature, expiration
+    and issuer), returns an (unsaved) token instance, or ``None`` if the token
+    was revoked.
+    """
+    client_id = payload.get("client_id")
+    if not isinstance(client_id, str):
+        return None
+    token_hash = get_adapter().hash_token(value)
+    cache = _get_cache()
+    if cache is not None and cache.get(cache_key(token_hash)) == REVOKED:
+        return None
+    instance = Token(
+        type=Token.Type.ACCESS_TOKEN,
+        hash=token_hash,
+        client_id=client_id,
+        expires_at=datetime.fromtimestamp(payload["exp"], tz=dt_timezone.utc),
+    )
+    instance.set_scopes(payload.get("scope", "").split())
+    return instance
+
+
+def invalidate(token_hashes: Iterable[str]) -> None:
+    """
+    Marks the access tokens as revoked in the cache, so that they are neither
+    served from the cache, nor accepted when validated locally.
+    """
+    cache = _get_cache()
+    if cache is not None:
+        cache.set_many(
+            {cache_key(token_hash): REVOKED for token_hash in token_hashes},
+            timeout=app_settings.ACCESS_TOKEN_EXPIRES_IN,
+        )
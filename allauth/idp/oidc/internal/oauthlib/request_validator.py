@@ -4,19 +4,20 @@ import uuid
 from datetime import timedelta
 
 from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 
-import jwt
 from oauthlib.openid import RequestValidator
 
 from allauth.core import context
-from allauth.core.internal import jwkkit
 from allauth.idp.oidc import app_settings
 from allauth.idp.oidc.adapter import get_adapter
+from allauth.idp.oidc.internal import purgekit
 from allauth.idp.oidc.internal.clientkit import (
     is_origin_allowed,
     is_redirect_uri_allowed,
 )
-from allauth.idp.oidc.internal.oauthlib import authorization_codes
+from allauth.idp.oidc.internal.keyring import get_keyring
+from allauth.idp.oidc.internal.oauthlib import access_tokens, authorization_codes
 from allauth.idp.oidc.internal.tokens import decode_jwt_token
 from allauth.idp.oidc.models import Client, Token
 
@@ -169,6 +170,7 @@ class OAuthLibRequestValidator(RequestValidator):
             if email:
                 t.set_scope_email(email)
         Token.objects.bulk_create(tokens)
+        purgekit.purge_periodically()
 
     def invalidate_authorization_code(
         self, client_id, code, request, *args, **kwargs
@@ -262,10 +264,7 @@ class OAuthLibRequestValidator(RequestValidator):
             )
         )
         adapter.populate_id_token(id_token, request.client, request.scopes)
-        jwk_dict, private_key = jwkkit.load_jwk_from_pem(app_settings.PRIVATE_KEY)
-        return jwt.encode(
-            id_token, private_key, algorithm="RS256", headers={"kid": jwk_dict["kid"]}
-        )
+        return get_keyring().sign(id_token)
 
     def validate_bearer_token(self, token, scopes, request) -> bool:
         if not token:
@@ -276,7 +275,7 @@ class OAuthLibRequestValidator(RequestValidator):
             # query parameters, such tokens may leak to log files and the HTTP
             # 'referer'.
             return False
-        instance = Token.objects.lookup(Token.Type.ACCESS_TOKEN, token)
+        instance = access_tokens.lookup(token)
         if not instance:
             return False
         if instance.user and not instance.user.is_active:
@@ -292,6 +291,38 @@ class OAuthLibRequestValidator(RequestValidator):
         request.access_token = instance
         return True
 
+    def _validate_jwt_access_token_locally(
+        self, token, payload, scopes, request
+    ) -> bool:
+        if context.request.GET.get("access_token") == token:
+            # See ``validate_bearer_token()``.
+            return False
+        instance = access_tokens.from_payload(token, payload)
+        if not instance:
+            return False
+        granted_scopes = instance.get_scopes()
+        if not set(scopes).issubset(set(granted_scopes)):
+            return False
+        client_id = instance.client_id
+        sub = payload.get("sub")
+
+        def get_client() -> Client:
+            client = Client.objects.get(pk=client_id)
+            client.client_id = client.id  # type: ignore[attr-defined]
+            return client
+
+        def get_user():
+            if not sub:
+                return None
+            return get_adapter().get_user_by_sub(request.client, sub)
+
+        # Nothing is loaded from the database, unless accessed.
+        request.client = SimpleLazyObject(get_client)
+        request.user = SimpleLazyObject(get_user)
+        request.scopes = granted_scopes
+        request.access_token = instance
+        return True
+
     def revoke_token(self, token, token_type_hint, request, *args, **kwargs) -> None:
         if token_type_hint == "access_token":  # nosec
             types = [Token.Type.ACCESS_TOKEN]
@@ -300,6 +331,8 @@ class OAuthLibRequestValidator(RequestValidator):
         else:
             types = [Token.Type.ACCESS_TOKEN, Token.Type.REFRESH_TOKEN]
         Token.objects.by_value(token).filter(type__in=types).delete()
+        if Token.Type.ACCESS_TOKEN in types:
+            access_tokens.invalidate([get_adapter().hash_token(token)])
 
     def get_userinfo_claims(self, request) -> dict:
         email = request.access_token.get_scope_email()
@@ -425,10 +458,17 @@ class OAuthLibRequestValidator(RequestValidator):
         return set(request.scopes).issubset(granted_scopes)
 
     def validate_jwt_bearer_token(self, token, scopes, request) -> bool:
-        if scopes:
-            # We don't have scope for the ID token
-            return False
         payload = decode_jwt_token(token, verify_iss=True, verify_exp=True)
         if payload is None:
             return False
+        if payload.get("token_use") == "access":  # nosec
+            # A JWT access token (``IDP_OIDC_ACCESS_TOKEN_FORMAT``).
+            if app_settings.ACCESS_TOKEN_LOCAL_VALIDATION_ENABLED:
+                return self._validate_jwt_access_token_locally(
+                    token, payload, scopes, request
+                )
+            return self.validate_bearer_token(token, scopes, request)
+        if scopes:
+            # We don't have scope for the ID token
+            return False
         return self.validate_client_id(payload["aud"], request)
@@ -6,14 +6,13 @@ import uuid
 
 from django.urls import reverse
 
-import jwt
 from oauthlib.oauth2.rfc8628.endpoints import DeviceApplicationServer
 from oauthlib.openid import Server
 
 from allauth.core import context
-from allauth.core.internal import jwkkit
 from allauth.idp.oidc import app_settings
 from allauth.idp.oidc.adapter import get_adapter
+from allauth.idp.oidc.internal.keyring import get_keyring
 from allauth.idp.oidc.internal.oauthlib.request_validator import (
     OAuthLibRequestValidator,
 )
@@ -46,10 +45,7 @@ def generate_jwt_access_token(request) -> str:
     adapter.populate_access_token(
         access_token, user=request.user, client=request.client, scopes=request.scopes
     )
-    jwk_dict, private_key = jwkkit.load_jwk_from_pem(app_settings.PRIVATE_KEY)
-    return jwt.encode(
-        access_token, private_key, algorithm="RS256", headers={"kid": jwk_dict["kid"]}
-    )
+    return get_keyring().sign(access_token)
 
 
 def generate_access_token(request) -> str:
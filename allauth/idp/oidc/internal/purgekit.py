@@ -0,0 +1,75 @@
+"""
+Expired tokens are never looked at again, yet, unless purged, they stay in the
+database forever. Purging is done in bounded batches, so that it can run
+alongside regular traffic: either by means of the ``oidc_purge_tokens``
+management command, or, when ``IDP_OIDC_TOKEN_PURGE_INTERVAL`` is set,
+piggybacking on the issuing of tokens.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from allauth.idp.oidc import app_settings
+from allauth.idp.oidc.models import Token
+
+
+BATCH_SIZE = 1000
+
+_lock = threading.Lock()
+_last_purged_at: Optional[float] = None
+
+
+@dataclass
+class PurgeStats:
+    deleted: int = 0
+    batches: int = 0
+    elapsed: float = 0.0
+    complete: bool = False
+
+
+def purge_expired_tokens(
+    batch_size: int = BATCH_SIZE,
+    time_budget: Optional[float] = None,
+    max_batches: Optional[int] = None,
+) -> PurgeStats:
+    """
+    Deletes expired tokens, ``batch_size`` at a time, until none are left,
+    or, until ``time_budget`` (in seconds) or ``max_batches`` is exhausted.
+    """
+    stats = PurgeStats()
+    start = time.monotonic()
+    while True:
+        if max_batches is not None and stats.batches >= max_batches:
+            break
+        if time_budget is not None and time.monotonic() - start >= time_budget:
+            break
+        pks = list(Token.objects.expired().values_list("pk", flat=True)[:batch_size])
+        if pks:
+            stats.deleted += Token.objects.filter(pk__in=pks).delete()[0]
+            stats.batches += 1
+        if len(pks) < batch_size:
+            stats.complete = True
+            break
+    stats.elapsed = time.monotonic() - start
+    return stats
+
+
+def purge_periodically() -> None:
+    """
+    Purges a single batch of expired tokens, at most once per
+    ``IDP_OIDC_TOKEN_PURGE_INTERVAL`` seconds (per process).
+    """
+    global _last_purged_at
+    interval = app_settings.TOKEN_PURGE_INTERVAL
+    if not interval:
+        return
+    now = time.monotonic()
+    with _lock:
+        if _last_purged_at is not None and now - _last_purged_at < interval:
+            return
+        _last_purged_at = now
+    purge_expired_tokens(max_batches=1)
@@ -2,9 +2,8 @@ from __future__ import annotations
 
 import jwt
 
-from allauth.core.internal import jwkkit
-from allauth.idp.oidc import app_settings
 from allauth.idp.oidc.adapter import get_adapter
+from allauth.idp.oidc.internal.keyring import get_keyring
 
 
 def decode_jwt_token(
@@ -13,7 +12,10 @@ def decode_jwt_token(
     if not value:
         return None
     try:
-        jwk_dict, private_key = jwkkit.load_jwk_from_pem(app_settings.PRIVATE_KEY)
+        header = jwt.get_unverified_header(value)
+        key = get_keyring().get_verifying_key(header.get("kid"))
+        if key is None:
+            return None
         issuer: str | None = None
         audience: str | None = None
         if client_id:
@@ -22,7 +24,7 @@ def decode_jwt_token(
             issuer = get_adapter().get_issuer()
         return jwt.decode(
             value,
-            key=private_key.public_key(),
+            key=key.public_key,
             algorithms=["RS256"],
             options={
                 "verify_signature": True,
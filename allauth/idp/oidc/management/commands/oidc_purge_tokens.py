@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from allauth.idp.oidc.internal.purgekit import BATCH_SIZE, purge_expired_tokens
+
+
+class Command(BaseCommand):
+    help = "Deletes expired tokens."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="The number of tokens to delete at a time.",
+        )
+        parser.add_argument(
+            "--time-budget",
+            type=float,
+            default=None,
+            help="Stop after this many seconds, even if expired tokens remain.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        stats = purge_expired_tokens(
+            batch_size=options["batch_size"], time_budget=options["time_budget"]
+        )
+        self.stdout.write(
+            f"Purged {stats.deleted} tokens in {stats.batches} batches"
+            f" ({stats.elapsed:.1f}s)."
+        )
+        if not stats.complete:
+            self.stdout.write("Time budget exhausted, expired tokens remain.")
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("allauth_idp_oidc", "0003_client_allow_uri_wildcards"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="token",
+            index=models.Index(
+                fields=["user", "type", "expires_at"],
+                name="allauth_idp_user_id_258b89_idx",
+            ),
+        ),
+    ]
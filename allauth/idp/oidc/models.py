@@ -188,6 +188,9 @@ class TokenQuerySet(models.query.QuerySet):
             Q(expires_at__isnull=True) | Q(expires_at__gt=timezone.now())
         )
 
+    def expired(self) -> TokenQuerySet:
+        return self.filter(expires_at__lte=timezone.now())
+
     def by_value(self, value: str) -> TokenQuerySet:
         return self.filter(hash=get_adapter().hash_token(value))
 
@@ -217,6 +220,9 @@ class Token(models.Model):
 
     class Meta:
         unique_together = (("type", "hash"),)
+        indexes = [
+            models.Index(fields=["user", "type", "expires_at"]),
+        ]
 
     def __str__(self) -> str:
         if self.user_id:
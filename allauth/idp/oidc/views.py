@@ -19,8 +19,9 @@ from django.http import (
 from django.middleware.csrf import CsrfViewMiddleware
 from django.shortcuts import render
 from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.utils.decorators import method_decorator
-from django.utils.http import urlencode
+from django.utils.http import quote_etag, urlencode
 from django.views import View
 from django.views.decorators.clickjacking import xframe_options_deny
 from django.views.decorators.csrf import csrf_exempt
@@ -32,7 +33,6 @@ from oauthlib.oauth2.rfc6749.errors import InvalidScopeError, OAuth2Error
 from allauth.account import app_settings as account_settings
 from allauth.account.adapter import get_adapter as get_account_adapter
 from allauth.account.internal.decorators import login_not_required
-from allauth.core.internal import jwkkit
 from allauth.core.internal.httpkit import (
     add_query_params,
     authenticated_user,
@@ -47,6 +47,7 @@ from allauth.idp.oidc.forms import (
     RPInitiatedLogoutForm,
 )
 from allauth.idp.oidc.internal import flows
+from allauth.idp.oidc.internal.keyring import get_keyring
 from allauth.idp.oidc.internal.oauthlib import device_codes
 from allauth.idp.oidc.internal.oauthlib.server import get_device_server, get_server
 from allauth.idp.oidc.internal.oauthlib.utils import (
@@ -429,12 +430,19 @@ user_info = UserInfoView.as_view()
 
 @method_decorator(login_not_required, name="dispatch")
 class JwksView(View):
-    def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> JsonResponse:
-        keys = []
-        for pem in [app_settings.PRIVATE_KEY]:
-            jwk, _ = jwkkit.load_jwk_from_pem(pem)
-            keys.append(jwk)
-        response = JsonResponse({"keys": keys})
+    # Relying parties (and caches in between) may hold on to the keys for this
+    # long. When rotating, publish the new key (``IDP_OIDC_VERIFICATION_KEYS``)
+    # at least this long before it is used for signing.
+    max_age = 60 * 60
+
+    def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        keyring = get_keyring()
+        etag = quote_etag(keyring.jwks_etag)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(keyring.jwks, content_type="application/json")
+            response["ETag"] = etag
+        patch_cache_control(response, public=True, max_age=self.max_age)
         response["Access-Control-Allow-Origin"] = "*"
         return response
 
@@ -114,6 +114,10 @@ class AppSettings:
     def TRUST_ENABLED(self) -> bool:
         return self._setting("TRUST_ENABLED", False)
 
+    @property
+    def TRUST_CACHE_ALIAS(self) -> str | None:
+        return self._setting("TRUST_CACHE_ALIAS", None)
+
     @property
     def _TRUST_STAGE_ENABLED(self) -> bool:
         from allauth.account import app_settings as account_settings
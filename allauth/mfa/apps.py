@@ -12,8 +12,14 @@ class MFAConfig(AppConfig):
     )
 
     def ready(self) -> None:
+        from django.db.models.signals import post_delete, post_save
+
         from allauth.account import signals as account_signals
         from allauth.mfa import checks  # noqa
         from allauth.mfa import signals
+        from allauth.mfa.internal.flows import trust
+        from allauth.mfa.models import Authenticator
 
         account_signals._add_email.connect(signals.on_add_email)
+        for sig in [post_save, post_delete]:
+            sig.connect(receiver=trust.on_authenticator_changed, sender=Authenticator)
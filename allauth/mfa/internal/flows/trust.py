@@ -4,7 +4,9 @@ import time
 from dataclasses import dataclass
 
 from django.contrib.auth.models import AbstractBaseUser
+from django.core.cache import BaseCache, caches
 from django.core.signing import BadSignature, Signer
+from django.db import transaction
 from django.http import HttpRequest, HttpResponse
 from django.utils.crypto import salted_hmac
 
@@ -18,12 +20,21 @@ class IssuedTrust:
     at: int
 
 
-def create_config_fingerprint(user: AbstractBaseUser) -> str:
-    """
-    If the user changes anything about his security setup, we want to invalidate
-    any trust that was issued before.
-    """
-    salt = "allauth.mfa.trust"
+FINGERPRINT_SALT = "allauth.mfa.trust"
+
+
+def _get_cache() -> BaseCache | None:
+    alias = app_settings.TRUST_CACHE_ALIAS
+    if not alias:
+        return None
+    return caches[alias]
+
+
+def _get_cache_key(user_id) -> str:
+    return f"allauth.mfa.trust.fingerprint[{user_id}]"
+
+
+def _create_config_fingerprint(user: AbstractBaseUser) -> str:
     parts: list[str] = []
     parts.append(str(user.pk))
     parts.append(user.password)
@@ -33,7 +44,51 @@ def create_config_fingerprint(user: AbstractBaseUser) -> str:
         seed = authenticator.data.get("seed")
         if seed is not None:
             parts.append(str(seed))
-    return salted_hmac(salt, "|".join(parts), algorithm="sha256").hexdigest()
+    return salted_hmac(
+        FINGERPRINT_SALT, "|".join(parts), algorithm="sha256"
+    ).hexdigest()
+
+
+def create_config_fingerprint(user: AbstractBaseUser) -> str:
+    """
+    If the user changes anything about his security setup, we want to invalidate
+    any trust that was issued before.
+
+    The fingerprint is cached (``MFA_TRUST_CACHE_ALIAS``) for as long as the
+    authenticators of the user remain unchanged. A password change is detected
+    by comparing a digest of the password hash.
+    """
+    cache = _get_cache()
+    if cache is None:
+        return _create_config_fingerprint(user)
+    password_digest = salted_hmac(
+        FINGERPRINT_SALT, user.password, algorithm="sha256"
+    ).hexdigest()
+    key = _get_cache_key(user.pk)
+    entry = cache.get(key)
+    if entry and entry[0] == password_digest:
+        return entry[1]
+    fingerprint = _create_config_fingerprint(user)
+    cache.set(key, (password_digest, fingerprint))
+    return fingerprint
+
+
+def invalidate_config_fingerprint(user_id) -> None:
+    cache = _get_cache()
+    if cache is not None:
+        cache.delete(_get_cache_key(user_id))
+
+
+def on_authenticator_changed(instance: Authenticator, **kwargs) -> None:
+    update_fields = kwargs.get("update_fields")
+    if update_fields and set(update_fields) == {"last_used_at"}:
+        # Recording usage does not alter the security setup.
+        return
+    user_id = instance.user_id
+    invalidate_config_fingerprint(user_id)
+    # A fingerprint created before the transaction is committed would
+    # otherwise be cached as it was before the change.
+    transaction.on_commit(lambda: invalidate_config_fingerprint(user_id))
 
 
 def decode_trust_cookie(request: HttpRequest) -> list[IssuedTrust]:
@@ -0,0 +1,66 @@
+import hashlib
+
+from django.db import migrations, models
+
+from fido2.utils import websafe_decode, websafe_encode
+from fido2.webauthn import AttestationObject
+
+
+BATCH_SIZE = 500
+
+
+def forwards(apps, schema_editor):
+    Authenticator = apps.get_model("mfa", "Authenticator")
+    authenticators = Authenticator.objects.filter(
+        type="webauthn", credential_id_hash__isnull=True
+    )
+    seen = set(
+        Authenticator.objects.filter(credential_id_hash__isnull=False).values_list(
+            "credential_id_hash", flat=True
+        )
+    )
+    batch = []
+    for authenticator in authenticators.order_by("pk").iterator():
+        # Deliberately not using the app code here, as that may change after
+        # this migration has been written. Rows that cannot be parsed are left
+        # without a hash and are picked up by the lookup fallback instead. The
+        # same goes for credential IDs that were registered more than once, of
+        # which only the first registration gets the (unique) hash.
+        try:
+            attestation_object = websafe_decode(
+                authenticator.data["credential"]["response"]["attestationObject"]
+            )
+            credential_data = AttestationObject(
+                attestation_object
+            ).auth_data.credential_data
+        except (ValueError, TypeError, KeyError):
+            continue
+        if not credential_data:
+            continue
+        credential_id_hash = hashlib.sha256(credential_data.credential_id).hexdigest()
+        if credential_id_hash in seen:
+            continue
+        seen.add(credential_id_hash)
+        authenticator.data["credential_data"] = websafe_encode(credential_data)
+        authenticator.credential_id_hash = credential_id_hash
+        batch.append(authenticator)
+        if len(batch) >= BATCH_SIZE:
+            Authenticator.objects.bulk_update(batch, ["data", "credential_id_hash"])
+            batch = []
+    if batch:
+        Authenticator.objects.bulk_update(batch, ["data", "credential_id_hash"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("mfa", "0003_authenticator_type_uniq"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="authenticator",
+            name="credential_id_hash",
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+        migrations.RunPython(forwards, migrations.RunPython.noop),
+    ]
@@ -34,6 +34,12 @@ class Authenticator(models.Model):
     data = models.JSONField()
     created_at = models.DateTimeField(default=timezone.now)
     last_used_at = models.DateTimeField(null=True)
+    # WebAuthn only: the SHA-256 hash of the credential ID, allowing for the
+    # authenticator to be looked up without parsing the stored credentials. A
+    # credential ID can only be registered once.
+    credential_id_hash = models.CharField(
+        max_length=64, null=True, blank=True, unique=True
+    )
 
     class Meta:
         constraints = [
@@ -6,12 +6,16 @@ import time
 from hashlib import sha1
 
 from django.contrib.auth.base_user import AbstractBaseUser
+from django.utils.crypto import salted_hmac
 
 from allauth.mfa import app_settings
 from allauth.mfa.models import Authenticator
 from allauth.mfa.utils import decrypt, encrypt
 
 
+INDEX_SALT = "allauth.mfa.recovery_codes.index"
+
+
 class RecoveryCodes:
     def __init__(self, instance: Authenticator) -> None:
         self.instance = instance
@@ -31,8 +35,10 @@ class RecoveryCodes:
                 "used_mask": 0,
             },
         )
+        rc = cls(instance)
+        rc._get_code_index()
         instance.save()
-        return cls(instance)
+        return rc
 
     @classmethod
     def generate_seed(self) -> str:
@@ -72,7 +78,10 @@ class RecoveryCodes:
         used_mask = self.instance.data["used_mask"]
         used_mask |= 1 << i
         self.instance.data["used_mask"] = used_mask
-        self.instance.save()
+        self._save()
+
+    def _save(self) -> None:
+        self.instance.save(update_fields=["data"] if self.instance.pk else None)
 
     def get_unused_codes(self) -> list[str]:
         migrated_codes = self._get_migrated_codes()
@@ -86,33 +95,61 @@ class RecoveryCodes:
             ret.append(code)
         return ret
 
-    def _validate_migrated_code(self, code: str) -> bool | None:
-        migrated_codes = self._get_migrated_codes()
-        if migrated_codes is None:
-            return None
-        try:
-            idx = migrated_codes.index(code)
-        except ValueError:
-            return False
-        else:
-            migrated_codes = self.instance.data["migrated_codes"]
-            assert isinstance(migrated_codes, list)  # nosec
-            migrated_codes.pop(idx)
-            self.instance.data["migrated_codes"] = migrated_codes
-            self.instance.save()
-            return True
+    def _hash_code(self, code: str) -> str:
+        return salted_hmac(
+            INDEX_SALT, f"{self.instance.user_id}:{code}", algorithm="sha256"
+        ).hexdigest()
+
+    def _get_code_index_key(self) -> str:
+        # Changes whenever the secret key or the settings affecting the codes
+        # change, which invalidates the index.
+        return salted_hmac(
+            INDEX_SALT,
+            f"{app_settings.RECOVERY_CODE_COUNT}:{app_settings.RECOVERY_CODE_DIGITS}",
+            algorithm="sha256",
+        ).hexdigest()[:16]
+
+    def _get_code_index(self) -> tuple[dict[str, int], bool]:
+        """
+        Returns the keyed hashes of the codes, mapped to their slot, along with
+        whether or not the index was (re)built. Storing the hashes avoids
+        having to regenerate all codes on each validation.
+        """
+        key = self._get_code_index_key()
+        index = self.instance.data.get("code_index")
+        if index and index["key"] == key:
+            return index["slots"], False
+        slots = {
+            self._hash_code(code): i for i, code in enumerate(self.generate_codes())
+        }
+        self.instance.data["code_index"] = {"key": key, "slots": slots}
+        return slots, True
+
+    def _use_migrated_code(self, idx: int) -> None:
+        migrated_codes = self.instance.data["migrated_codes"]
+        assert isinstance(migrated_codes, list)  # nosec
+        migrated_codes.pop(idx)
+        self.instance.data["migrated_codes"] = migrated_codes
+        slots = self.instance.data["code_index"]["slots"]
+        self.instance.data["code_index"]["slots"] = {
+            code_hash: i if i < idx else i - 1
+            for code_hash, i in slots.items()
+            if i != idx
+        }
+        self._save()
 
     def validate_code(self, code: str) -> bool:
-        ret = self._validate_migrated_code(code)
-        if ret is not None:
-            return ret
-
-        for i, c in enumerate(self.generate_codes()):
-            if self._is_code_used(i):
-                continue
-            if secrets.compare_digest(code, c):
-                self._mark_code_used(i)
+        slots, rebuilt = self._get_code_index()
+        idx = slots.get(self._hash_code(code))
+        if idx is not None:
+            if "migrated_codes" in self.instance.data:
+                self._use_migrated_code(idx)
+                return True
+            if not self._is_code_used(idx):
+                self._mark_code_used(idx)
                 return True
+        if rebuilt:
+            self._save()
         return False
 
     def mark_as_viewed(self) -> None:
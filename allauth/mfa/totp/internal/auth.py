@@ -41,12 +41,17 @@ def yield_hotp_counters_from_time() -> Iterator[int]:
         yield counter + i
 
 
-def hotp_value(secret: str, counter: int) -> int:
+def decode_totp_secret(secret: str) -> bytes:
+    return base64.b32decode(secret.encode("ascii"), casefold=True)
+
+
+def hotp_value(secret: str | bytes, counter: int) -> int:
     # Convert the counter to a byte array using big-endian encoding
     counter_bytes = struct.pack(">Q", counter)
-    secret_enc = base64.b32decode(secret.encode("ascii"), casefold=True)
+    if isinstance(secret, str):
+        secret = decode_totp_secret(secret)
     # Calculate the HMAC-SHA1 hash using the secret and counter
-    hmac_result = hmac.new(secret_enc, counter_bytes, hashlib.sha1).digest()
+    hmac_result = hmac.new(secret, counter_bytes, hashlib.sha1).digest()
     # Get the last 4 bits of the HMAC result to determine the offset
     offset = hmac_result[-1] & 0x0F
     # Extract an 31-bit slice from the HMAC result starting at the offset + 1 bit
@@ -67,15 +72,22 @@ def _is_insecure_bypass(code: str) -> bool:
     return bool(code and app_settings.TOTP_INSECURE_BYPASS_CODE == code)
 
 
+def match_totp_code(secret: str, code: str) -> int | None:
+    """
+    Returns the counter for which the code is valid, if any.
+    """
+    secret_enc = decode_totp_secret(secret)
+    for counter in yield_hotp_counters_from_time():
+        value = hotp_value(secret_enc, counter)
+        if secrets.compare_digest(code, format_hotp_value(value)):
+            return counter
+    return None
+
+
 def validate_totp_code(secret: str, code: str) -> bool:
     if _is_insecure_bypass(code):
         return True
-    counters = yield_hotp_counters_from_time()
-    for counter in counters:
-        value = hotp_value(secret, counter)
-        if secrets.compare_digest(code, format_hotp_value(value)):
-            return True
-    return False
+    return match_totp_code(secret, code) is not None
 
 
 class TOTP:
@@ -95,20 +107,21 @@ class TOTP:
     def validate_code(self, code: str) -> bool:
         if _is_insecure_bypass(code):
             return True
-        if self._is_code_used(code):
-            return False
-
         secret = decrypt(self.instance.data["secret"])
-        valid = validate_totp_code(secret, code)
-        if valid:
-            self._mark_code_used(code)
-        return valid
-
-    def _get_used_cache_key(self, code: str) -> str:
-        return f"allauth.mfa.totp.used?user={self.instance.user_id}&code={code}"
-
-    def _is_code_used(self, code: str) -> bool:
-        return cache.get(self._get_used_cache_key(code)) == "y"
-
-    def _mark_code_used(self, code: str) -> None:
-        cache.set(self._get_used_cache_key(code), "y", timeout=app_settings.TOTP_PERIOD)
+        counter = match_totp_code(secret, code)
+        if counter is None:
+            return False
+        return self._mark_counter_used(counter)
+
+    def _get_used_cache_key(self, counter: int) -> str:
+        return f"allauth.mfa.totp.used?user={self.instance.user_id}&counter={counter}"
+
+    def _mark_counter_used(self, counter: int) -> bool:
+        """
+        Marks the counter as used, returning whether it was not used before. As
+        this is a single atomic operation, out of concurrent requests using the
+        same code exactly one succeeds.
+        """
+        # A counter is accepted for as long as it falls within the tolerance.
+        timeout = app_settings.TOTP_PERIOD * (2 * app_settings.TOTP_TOLERANCE + 1)
+        return cache.add(self._get_used_cache_key(counter), "y", timeout=timeout)
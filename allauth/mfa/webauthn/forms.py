@@ -49,6 +49,9 @@ class _BaseAddWebAuthnForm(forms.Form):
             # Pokemon-style exception handling.
             auth.parse_registration_response(credential)
             auth.complete_registration(credential)
+            credential_data = auth.extract_credential_data(credential)
+            if auth.is_credential_id_registered(credential_data.credential_id):
+                raise get_adapter().validation_error("incorrect_code")
         return cleaned_data
 
 
@@ -81,12 +84,15 @@ class AuthenticateWebAuthnForm(forms.Form):
         # Explicitly parse JSON payload -- otherwise, authenticate_complete()
         # crashes with some random TypeError and we don't want to do
         # Pokemon-style exception handling.
-        auth.parse_authentication_response(credential)
+        response = auth.parse_authentication_response(credential)
         user = self.user
         if user is None:
             user = auth.extract_user_from_response(credential)
         clear_rl = check_rate_limit(user)
-        authenticator = auth.complete_authentication(user, credential)
+        authenticator = auth.get_authenticator_by_credential_id(user, response.raw_id)
+        if not authenticator:
+            raise get_adapter().validation_error("incorrect_code")
+        auth.complete_authentication(authenticator, credential)
         clear_rl()
         return authenticator
 
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import hashlib
 from typing import Any
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.base_user import AbstractBaseUser
+from django.core.exceptions import ValidationError
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 
 import fido2.features
 from fido2.server import Fido2Server
-from fido2.utils import websafe_decode
+from fido2.utils import websafe_decode, websafe_encode
 from fido2.webauthn import (
     AttestedCredentialData,
     AuthenticationResponse,
@@ -53,13 +57,33 @@ def clear_state() -> None:
     context.request.session.pop(STATE_SESSION_KEY, None)
 
 
+# Keyed by the relying party, so that a change of host or site name is picked
+# up right away.
+_servers: dict[tuple[tuple[tuple[str, str], ...], bool], Fido2Server] = {}
+MAX_SERVERS = 64
+
+
+@receiver(setting_changed)
+def _clear_servers(**kwargs) -> None:
+    _servers.clear()
+
+
 def get_server() -> Fido2Server:
+    # The adapter is consulted on every call, as the relying party it returns
+    # may depend on the request. Only constructing the server is avoided.
     rp_kwargs = get_adapter().get_public_key_credential_rp_entity()
-    rp = PublicKeyCredentialRpEntity(**rp_kwargs)
-    verify_origin = None
-    if app_settings.WEBAUTHN_ALLOW_INSECURE_ORIGIN:
-        verify_origin = lambda o: True  # noqa
-    server = Fido2Server(rp, verify_origin=verify_origin)
+    allow_insecure_origin = app_settings.WEBAUTHN_ALLOW_INSECURE_ORIGIN
+    key = (tuple(sorted(rp_kwargs.items())), allow_insecure_origin)
+    server = _servers.get(key)
+    if server is None:
+        rp = PublicKeyCredentialRpEntity(**rp_kwargs)
+        verify_origin = None
+        if allow_insecure_origin:
+            verify_origin = lambda o: True  # noqa
+        server = Fido2Server(rp, verify_origin=verify_origin)
+        if len(_servers) >= MAX_SERVERS:
+            _servers.clear()
+        _servers[key] = server
     return server
 
 
@@ -106,29 +130,76 @@ def complete_registration(credential: dict) -> AuthenticatorData:
     return binding
 
 
+def extract_credential_data(credential: dict) -> AttestedCredentialData:
+    credential_data = parse_registration_response(
+        credential
+    ).response.attestation_object.auth_data.credential_data
+    if not credential_data:
+        raise get_adapter().validation_error("incorrect_code")
+    return credential_data
+
+
+def hash_credential_id(credential_id: bytes) -> str:
+    return hashlib.sha256(credential_id).hexdigest()
+
+
 def get_credentials(user: AbstractBaseUser) -> list[AttestedCredentialData]:
     credentials: list[AttestedCredentialData] = []
     authenticators = Authenticator.objects.filter(
         user_id=user.pk, type=Authenticator.Type.WEBAUTHN
     )
     for authenticator in authenticators:
-        credential_data = authenticator.wrap().authenticator_data.credential_data
+        credential_data = authenticator.wrap().credential_data
         if credential_data:
-            credentials.append(authenticator.wrap().authenticator_data.credential_data)
+            credentials.append(credential_data)
     return credentials
 
 
+def is_credential_id_registered(credential_id: bytes) -> bool:
+    """
+    A credential ID must not be registered more than once, across all users
+    (WebAuthn §7.1, step 22).
+    """
+    return Authenticator.objects.filter(
+        type=Authenticator.Type.WEBAUTHN,
+        credential_id_hash=hash_credential_id(credential_id),
+    ).exists()
+
+
 def get_authenticator_by_credential_id(
     user: AbstractBaseUser, credential_id: bytes
 ) -> Authenticator | None:
+    """
+    Looks up the authenticator of the user by the (indexed) hash of the
+    credential ID. Authenticators that have no hash yet (e.g. the data
+    migration could not process them) are scanned as a fallback, and get their
+    hash stored once found.
+    """
+    credential_id_hash = hash_credential_id(credential_id)
     authenticators = Authenticator.objects.filter(
         user_id=user.pk, type=Authenticator.Type.WEBAUTHN
     )
+    authenticator = _match_credential_id(
+        authenticators.filter(credential_id_hash=credential_id_hash), credential_id
+    )
+    if authenticator:
+        return authenticator
+    authenticator = _match_credential_id(
+        authenticators.filter(credential_id_hash__isnull=True), credential_id
+    )
+    if authenticator and not is_credential_id_registered(credential_id):
+        authenticator.credential_id_hash = credential_id_hash
+        authenticator.save(update_fields=["credential_id_hash"])
+    return authenticator
+
+
+def _match_credential_id(authenticators, credential_id: bytes) -> Authenticator | None:
     for authenticator in authenticators:
-        if (
-            credential_id
-            == authenticator.wrap().authenticator_data.credential_data.credential_id
-        ):
+        try:
+            credential_data = authenticator.wrap().credential_data
+        except ValidationError:
+            continue
+        if credential_data and credential_data.credential_id == credential_id:
             return authenticator
     return None
 
@@ -162,22 +233,19 @@ def extract_user_from_response(response: dict) -> AbstractBaseUser:
     return user
 
 
-def complete_authentication(user: AbstractBaseUser, response: dict) -> Authenticator:
-    credentials = get_credentials(user)
+def complete_authentication(authenticator: Authenticator, response: dict) -> None:
     server = get_server()
     state = get_state()
     if not state:
         raise get_adapter().validation_error("incorrect_code")
     try:
-        binding = server.authenticate_complete(state, credentials, response)
+        server.authenticate_complete(
+            state, [authenticator.wrap().credential_data], response
+        )
     except ValueError as e:
         # ValueError: Unknown credential ID.
         raise get_adapter().validation_error("incorrect_code") from e
     clear_state()
-    authenticator = get_authenticator_by_credential_id(user, binding.credential_id)
-    if not authenticator:
-        raise get_adapter().validation_error("incorrect_code")
-    return authenticator
 
 
 class WebAuthn:
@@ -186,12 +254,15 @@ class WebAuthn:
 
     @classmethod
     def add(cls, user: AbstractBaseUser, name: str, credential: dict) -> "WebAuthn":
+        credential_data = extract_credential_data(credential)
         instance = Authenticator(
             user=user,  # type:ignore[misc]
             type=Authenticator.Type.WEBAUTHN,
+            credential_id_hash=hash_credential_id(credential_data.credential_id),
             data={
                 "name": name,
                 "credential": credential,
+                "credential_data": websafe_encode(credential_data),
             },
         )
         instance.save()
@@ -211,6 +282,13 @@ class WebAuthn:
             self.instance.data["credential"]
         ).response.attestation_object.auth_data
 
+    @property
+    def credential_data(self) -> AttestedCredentialData | None:
+        encoded = self.instance.data.get("credential_data")
+        if encoded:
+            return AttestedCredentialData(websafe_decode(encoded))
+        return self.authenticator_data.credential_data
+
     @property
     def is_passwordless(self) -> bool | None:
         return (
@@ -5,7 +5,6 @@ import warnings
 from typing import TYPE_CHECKING
 
 from django.core.exceptions import ImproperlyConfigured, MultipleObjectsReturned
-from django.db.models import Q
 from django.http import HttpRequest
 from django.urls import reverse
 from django.utils.crypto import get_random_string
@@ -21,6 +20,7 @@ from allauth.account.internal.emailkit import valid_email_or_none
 from allauth.account.utils import user_email, user_field, user_username
 from allauth.core.internal.adapter import BaseAdapter
 from allauth.core.internal.modelkit import deserialize_instance, serialize_instance
+from allauth.socialaccount.internal import appkit
 from allauth.utils import import_attribute
 
 from . import app_settings
@@ -245,67 +245,12 @@ class DefaultSocialAccountAdapter(BaseAdapter):
         """SocialApp's can be setup in the database, or, via
         `settings.SOCIALACCOUNT_PROVIDERS`.  This methods returns a uniform list
         of all known apps matching the specified criteria, and blends both
-        (db/settings) sources of data.
+        (db/settings) sources of data. The apps are cached, and shared, so they
+        must not be altered.
         """
-        # NOTE: Avoid loading models at top due to registry boot...
-        from allauth.socialaccount.models import SocialApp
-
-        # Map provider to the list of apps.
-        provider_to_apps: dict = {}
-
-        # First, populate it with the DB backed apps.
-        if request:
-            db_apps = SocialApp.objects.on_site(request)
-        else:
-            db_apps = SocialApp.objects.all()
-        if provider:
-            db_apps = db_apps.filter(Q(provider=provider) | Q(provider_id=provider))
-        if client_id:
-            db_apps = db_apps.filter(client_id=client_id)
-        for app in db_apps:
-            apps = provider_to_apps.setdefault(app.provider, [])
-            apps.append(app)
-
-        # Then, extend it with the settings backed apps.
-        for p, pcfg in app_settings.PROVIDERS.items():
-            app_configs = pcfg.get("APPS")
-            if app_configs is None:
-                app_config = pcfg.get("APP")
-                if app_config is None:
-                    continue
-                app_configs = [app_config]
-
-            apps = provider_to_apps.setdefault(p, [])
-            for config in app_configs:
-                app = SocialApp(provider=p)
-                for field in [
-                    "name",
-                    "provider_id",
-                    "client_id",
-                    "secret",
-                    "key",
-                    "settings",
-                ]:
-                    if field in config:
-                        setattr(app, field, config[field])
-                if "certificate_key" in config:
-                    warnings.warn("'certificate_key' should be moved into app.settings")
-                    app.settings["certificate_key"] = config["certificate_key"]
-                if client_id and app.client_id != client_id:
-                    continue
-                if (
-                    provider
-                    and app.provider_id != provider
-                    and app.provider != provider
-                ):
-                    continue
-                apps.append(app)
-
-        # Flatten the list of apps.
-        apps = []
-        for provider_apps in provider_to_apps.values():
-            apps.extend(provider_apps)
-        return apps
+        return appkit.get_registry(request).filter(
+            provider=provider, client_id=client_id
+        )
 
     def get_app(self, request: HttpRequest, provider, client_id=None):
         from allauth.socialaccount.models import SocialApp
@@ -324,9 +269,14 @@ class DefaultSocialAccountAdapter(BaseAdapter):
         return get_account_adapter().send_notification_mail(*args, **kwargs)
 
     def get_requests_session(self):
-        import requests
+        """
+        Returns the session used for performing upstream requests, backed by a
+        process wide connection pool. Override this to e.g. register response
+        hooks (``session.hooks["response"]``) for collecting metrics.
+        """
+        from allauth.socialaccount.internal.requestskit import PooledSession
 
-        session = requests.Session()
+        session = PooledSession()
         session.request = functools.partial(
             session.request, timeout=app_settings.REQUESTS_TIMEOUT
         )
@@ -154,10 +154,30 @@ class AppSettings:
     def SOCIALACCOUNT_STR(self):
         return self._setting("SOCIALACCOUNT_STR", None)
 
+    @property
+    def APPS_CACHE_MAX_AGE(self) -> int:
+        return self._setting("APPS_CACHE_MAX_AGE", 60)
+
+    @property
+    def APPS_CACHE_ALIAS(self) -> str | None:
+        return self._setting("APPS_CACHE_ALIAS", None)
+
     @property
     def REQUESTS_TIMEOUT(self) -> int:
         return self._setting("REQUESTS_TIMEOUT", 5)
 
+    @property
+    def REQUESTS_POOL_MAXSIZE(self) -> int:
+        return self._setting("REQUESTS_POOL_MAXSIZE", 10)
+
+    @property
+    def REQUESTS_MAX_RETRIES(self):
+        return self._setting("REQUESTS_MAX_RETRIES", 0)
+
+    @property
+    def REQUESTS_MAX_WORKERS(self) -> int:
+        return self._setting("REQUESTS_MAX_WORKERS", 10)
+
     @property
     def OPENID_CONNECT_URL_PREFIX(self) -> str:
         return self._setting("OPENID_CONNECT_URL_PREFIX", "oidc")
@@ -12,7 +12,16 @@ class SocialAccountConfig(AppConfig):
     default_auto_field = app_settings.DEFAULT_AUTO_FIELD or "django.db.models.AutoField"
 
     def ready(self) -> None:
+        from django.db.models.signals import m2m_changed, post_delete, post_save
+
         from allauth.socialaccount import checks  # noqa
+        from allauth.socialaccount.internal import appkit
+        from allauth.socialaccount.models import SocialApp
         from allauth.socialaccount.providers import registry
 
         registry.load()
+        for sig in [post_save, post_delete]:
+            sig.connect(receiver=appkit.on_app_changed, sender=SocialApp)
+        m2m_changed.connect(
+            receiver=appkit.on_app_changed, sender=SocialApp.sites.through
+        )
@@ -0,0 +1,203 @@
+"""
+Caches the social apps, as configured in the database and in
+``SOCIALACCOUNT_PROVIDERS``, so that looking up an app (which happens multiple
+times for rendering a single login page) does not require a query each time.
+
+The cache is kept per site, and is invalidated whenever an app is changed in
+this process. Other processes pick up changes once the cached apps expire
+(``SOCIALACCOUNT_APPS_CACHE_MAX_AGE``), or, if a shared cache is configured
+(``SOCIALACCOUNT_APPS_CACHE_ALIAS``), right away.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+import warnings
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
+from django.http import HttpRequest
+
+from allauth import app_settings as allauth_settings
+from allauth.socialaccount import app_settings
+
+
+if TYPE_CHECKING:
+    from allauth.socialaccount.models import SocialApp
+
+
+VERSION_CACHE_KEY = "allauth.socialaccount.apps.version"
+
+
+@dataclass
+class AppRegistry:
+    apps: list[SocialApp]
+    version: Optional[str] = None
+    loaded_at: float = field(default_factory=time.time)
+    by_provider: dict[str, list[SocialApp]] = field(default_factory=dict)
+    by_client_id: dict[str, list[SocialApp]] = field(default_factory=dict)
+    _memo: dict = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        for app in self.apps:
+            self.by_provider.setdefault(app.provider, []).append(app)
+            if app.provider_id and app.provider_id != app.provider:
+                self.by_provider.setdefault(app.provider_id, []).append(app)
+            self.by_client_id.setdefault(app.client_id, []).append(app)
+
+    def filter(self, provider=None, client_id=None) -> list[SocialApp]:
+        if provider:
+            apps = self.by_provider.get(provider, [])
+            if client_id:
+                apps = [app for app in apps if app.client_id == client_id]
+        elif client_id:
+            apps = self.by_client_id.get(client_id, [])
+        else:
+            apps = self.apps
+        return list(apps)
+
+    def memoize(self, key: Any, compute: Callable[[], Any]) -> Any:
+        """
+        Memoizes data derived from the apps, so that it is discarded along
+        with the apps as soon as those change.
+        """
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+        value = compute()
+        self._memo[key] = value
+        return value
+
+
+_lock = threading.Lock()
+_registries: dict[Optional[int], AppRegistry] = {}
+# Bumped on every change, so that a registry that was being loaded while the
+# apps changed is not stored.
+_generation = 0
+
+
+def invalidate() -> None:
+    global _generation
+    with _lock:
+        _generation += 1
+        _registries.clear()
+    alias = app_settings.APPS_CACHE_ALIAS
+    if alias:
+        caches[alias].set(VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def on_app_changed(**kwargs) -> None:
+    invalidate()
+    # A lookup performed before the transaction is committed would otherwise
+    # cache the state as it was before the change.
+    transaction.on_commit(invalidate)
+
+
+@receiver(setting_changed)
+def _clear_registries(**kwargs) -> None:
+    with _lock:
+        _registries.clear()
+
+
+def _get_shared_version() -> Optional[str]:
+    alias = app_settings.APPS_CACHE_ALIAS
+    if not alias:
+        return None
+    cache = caches[alias]
+    version = cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(VERSION_CACHE_KEY, version, timeout=None):
+            version = cache.get(VERSION_CACHE_KEY)
+    return version
+
+
+def get_registry(request: Optional[HttpRequest]) -> AppRegistry:
+    """
+    Returns the registry of apps available on the site of the request (or,
+    all apps, in absence of a request).
+    """
+    max_age = app_settings.APPS_CACHE_MAX_AGE
+    if not max_age or hasattr(settings, "ALLAUTH_SETTING_GETTER"):
+        # Apps configured in the settings may vary per request.
+        return AppRegistry(apps=load_apps(request))
+    site_id = None
+    if request is not None and allauth_settings.SITES_ENABLED:
+        from django.contrib.sites.shortcuts import get_current_site
+
+        site_id = get_current_site(request).id  # type:ignore[union-attr]
+    version = _get_shared_version()
+    registry = _registries.get(site_id)
+    if (
+        registry is not None
+        and registry.version == version
+        and time.time() - registry.loaded_at < max_age
+    ):
+        return registry
+    generation = _generation
+    registry = AppRegistry(apps=load_apps(request), version=version)
+    with _lock:
+        if generation == _generation:
+            _registries[site_id] = registry
+    return registry
+
+
+def load_apps(request: Optional[HttpRequest]) -> list[SocialApp]:
+    """
+    Returns all apps, both database and settings backed.
+    """
+    # NOTE: Avoid loading models at top due to registry boot...
+    from allauth.socialaccount.models import SocialApp
+
+    # Map provider to the list of apps.
+    provider_to_apps: dict = {}
+
+    # First, populate it with the DB backed apps.
+    if request:
+        db_apps = SocialApp.objects.on_site(request)
+    else:
+        db_apps = SocialApp.objects.all()
+    for app in db_apps:
+        apps = provider_to_apps.setdefault(app.provider, [])
+        apps.append(app)
+
+    # Then, extend it with the settings backed apps.
+    for p, pcfg in app_settings.PROVIDERS.items():
+        app_configs = pcfg.get("APPS")
+        if app_configs is None:
+            app_config = pcfg.get("APP")
+            if app_config is None:
+                continue
+            app_configs = [app_config]
+
+        apps = provider_to_apps.setdefault(p, [])
+        for config in app_configs:
+            app = SocialApp(provider=p)
+            for attr in [
+                "name",
+                "provider_id",
+                "client_id",
+                "secret",
+                "key",
+                "settings",
+            ]:
+                if attr in config:
+                    setattr(app, attr, config[attr])
+            if "certificate_key" in config:
+                warnings.warn("'certificate_key' should be moved into app.settings")
+                app.settings["certificate_key"] = config["certificate_key"]
+            apps.append(app)
+
+    # Flatten the list of apps.
+    apps = []
+    for provider_apps in provider_to_apps.values():
+        apps.extend(provider_apps)
+    return apps
@@ -0,0 +1,163 @@
+"""
+Process wide cache of (JSON) documents published by providers, such as JWKS
+and OpenID Connect discovery documents. Documents are kept for as long as the
+provider indicates (``Cache-Control``/``Expires``), and, once expired, are
+still served while they are refreshed in the background.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable
+
+
+# Used when the provider does not indicate how long a document can be cached.
+DEFAULT_MAX_AGE = 5 * 60
+MAX_MAX_AGE = 24 * 60 * 60
+# How long an expired document is still served while it is being refreshed.
+STALE_WHILE_REVALIDATE = 60 * 60
+# Forced refreshes (e.g. on encountering an unknown key ID) are throttled, so
+# that they cannot be abused to flood the provider with requests.
+MIN_REFRESH_INTERVAL = 60
+
+
+@dataclass
+class Document:
+    url: str
+    data: Any
+    fetched_at: float
+    expires_at: float
+    stale_until: float
+    _keys: dict = field(default_factory=dict, repr=False)
+
+    def get_key(self, kid: str, lookup: Callable[[Any, str], Any]) -> Any:
+        """
+        Returns the (parsed) key, as looked up in this document, memoized.
+        Misses are not memoized, as the key ID is taken from (untrusted)
+        tokens.
+        """
+        memo_key = (lookup, kid)
+        try:
+            return self._keys[memo_key]
+        except KeyError:
+            pass
+        key = lookup(self.data, kid)
+        if key is not None:
+            self._keys[memo_key] = key
+        return key
+
+
+def parse_cache_headers(headers, now: float) -> tuple[float, float]:
+    """
+    Returns the (max age, stale while revalidate) in seconds.
+    """
+    headers = {k.lower(): v for k, v in headers.items()}
+    directives = {}
+    for directive in headers.get("cache-control", "").split(","):
+        name, _, value = directive.strip().partition("=")
+        directives[name.lower()] = value.strip('"')
+    if "no-store" in directives or "no-cache" in directives:
+        return 0, 0
+    max_age: float | None = None
+    try:
+        max_age = int(directives["max-age"])
+    except (KeyError, ValueError):
+        expires = headers.get("expires")
+        if expires:
+            try:
+                max_age = parsedate_to_datetime(expires).timestamp() - now
+            except (TypeError, ValueError):
+                max_age = 0
+    if max_age is None:
+        max_age = DEFAULT_MAX_AGE
+    try:
+        swr = int(directives["stale-while-revalidate"])
+    except (KeyError, ValueError):
+        swr = STALE_WHILE_REVALIDATE
+    return max(0, min(max_age, MAX_MAX_AGE)), max(0, swr)
+
+
+def fetch_document(url: str) -> Document:
+    from allauth.socialaccount.adapter import get_adapter
+
+    with get_adapter().get_requests_session() as sess:
+        response = sess.get(url)
+        response.raise_for_status()
+        data = response.json()
+    now = time.time()
+    max_age, swr = parse_cache_headers(response.headers, now)
+    return Document(
+        url=url,
+        data=data,
+        fetched_at=now,
+        expires_at=now + max_age,
+        stale_until=now + max_age + swr,
+    )
+
+
+class DocumentCache:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._documents: dict[str, Document] = {}
+        self._fetch_locks: dict[str, threading.Lock] = {}
+        self._revalidating: set[str] = set()
+
+    def get(self, url: str, *, refresh: bool = False) -> Document:
+        """
+        Returns the document, fetching it when needed. Pass ``refresh=True``
+        when the document is known to be outdated, e.g. when it lacks the key
+        that a token refers to.
+        """
+        now = time.time()
+        document = self._documents.get(url)
+        if document is not None:
+            if refresh:
+                if now - document.fetched_at < MIN_REFRESH_INTERVAL:
+                    return document
+            elif now < document.expires_at:
+                return document
+            elif now < document.stale_until:
+                self._revalidate(url, document)
+                return document
+        return self._fetch(url, document)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._documents.clear()
+
+    def _fetch(self, url: str, outdated: Document | None) -> Document:
+        with self._lock:
+            fetch_lock = self._fetch_locks.setdefault(url, threading.Lock())
+        # Single flight: concurrent requests for the same document wait for
+        # the one fetch that is in progress.
+        with fetch_lock:
+            document = self._documents.get(url)
+            if document is not None and document is not outdated:
+                return document
+            document = fetch_document(url)
+            self._documents[url] = document
+            return document
+
+    def _revalidate(self, url: str, outdated: Document) -> None:
+        with self._lock:
+            if url in self._revalidating:
+                return
+            self._revalidating.add(url)
+
+        def revalidate():
+            try:
+                self._fetch(url, outdated)
+            except Exception:  # nosec
+                # Keep serving the stale document, retried on next access.
+                pass
+            finally:
+                with self._lock:
+                    self._revalidating.discard(url)
+
+        threading.Thread(target=revalidate, daemon=True).start()
+
+
+documents = DocumentCache()
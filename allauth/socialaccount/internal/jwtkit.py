@@ -9,7 +9,7 @@ import jwt
 from cryptography.hazmat.backends import default_backend
 from cryptography.x509 import load_pem_x509_certificate
 
-from allauth.socialaccount.adapter import get_adapter
+from allauth.socialaccount.internal import cachekit
 from allauth.socialaccount.providers.oauth2.client import OAuth2Error
 
 
@@ -54,11 +54,10 @@ def fetch_key(credential, keys_url, lookup):
     # {'alg': 'RS256', 'kid': '0ad1fec78504f447bae65bcf5afaedb65eec9e81', 'typ': 'JWT'}
     kid = header["kid"]
     alg = header["alg"]
-    with get_adapter().get_requests_session() as sess:
-        response = sess.get(keys_url)
-        response.raise_for_status()
-        keys_data = response.json()
-    key = lookup(keys_data, kid)
+    key = cachekit.documents.get(keys_url).get_key(kid, lookup)
+    if not key:
+        # The provider may have rotated its keys.
+        key = cachekit.documents.get(keys_url, refresh=True).get_key(kid, lookup)
     if not key:
         raise OAuth2Error(f"Invalid 'kid': '{kid}'")
     return alg, key
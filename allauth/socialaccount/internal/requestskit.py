@@ -0,0 +1,64 @@
+"""
+Process wide connection pooling for requests made to providers, so that e.g.
+the token exchange and the profile fetch of a login reuse the same (kept
+alive) connection instead of performing a fresh TCP/TLS handshake each.
+"""
+
+from __future__ import annotations
+
+import os
+import requests
+import threading
+from requests.adapters import HTTPAdapter
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from allauth.socialaccount import app_settings
+
+
+_lock = threading.Lock()
+_adapters: dict[tuple, HTTPAdapter] = {}
+
+
+@receiver(setting_changed)
+def _clear_adapters(**kwargs) -> None:
+    with _lock:
+        _adapters.clear()
+
+
+def get_http_adapter() -> HTTPAdapter:
+    # Connections must not be shared with forked processes.
+    key = (
+        os.getpid(),
+        app_settings.REQUESTS_POOL_MAXSIZE,
+        app_settings.REQUESTS_MAX_RETRIES,
+    )
+    adapter = _adapters.get(key)
+    if adapter is None:
+        with _lock:
+            adapter = _adapters.get(key)
+            if adapter is None:
+                adapter = HTTPAdapter(
+                    pool_maxsize=app_settings.REQUESTS_POOL_MAXSIZE,
+                    max_retries=app_settings.REQUESTS_MAX_RETRIES,
+                )
+                _adapters[key] = adapter
+    return adapter
+
+
+class PooledSession(requests.Session):
+    """
+    A session using the process wide connection pool. Sessions themselves are
+    not shared, as that would leak cookies across users.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        adapter = get_http_adapter()
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def close(self) -> None:
+        # Leave the pooled connections open for reuse.
+        pass
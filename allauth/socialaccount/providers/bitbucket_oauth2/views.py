@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+from functools import partial
+
 from django.http import HttpRequest
 
 from allauth.socialaccount import app_settings
 from allauth.socialaccount.adapter import get_adapter
+from allauth.socialaccount.providers.oauth2.fanout import fan_out
 from allauth.socialaccount.providers.oauth2.views import (
     OAuth2Adapter,
     OAuth2CallbackView,
@@ -19,13 +22,18 @@ class BitbucketOAuth2Adapter(OAuth2Adapter):
     emails_url = "https://api.bitbucket.org/2.0/user/emails"
 
     def complete_login(self, request: HttpRequest, app, token, **kwargs):
+        extra_data, email = fan_out(
+            partial(self.get_profile, token),
+            partial(self.get_email, token) if app_settings.QUERY_EMAIL else None,
+        )
+        if email:
+            extra_data["email"] = email
+        return self.get_provider().sociallogin_from_response(request, extra_data)
+
+    def get_profile(self, token) -> dict:
         with get_adapter().get_requests_session() as sess:
             resp = sess.get(self.profile_url, params={"access_token": token.token})
-            extra_data = resp.json()
-        if app_settings.QUERY_EMAIL:
-            if email := self.get_email(token):
-                extra_data["email"] = email
-        return self.get_provider().sociallogin_from_response(request, extra_data)
+            return resp.json()
 
     def get_email(self, token) -> str:
         """Fetches email address from email API endpoint"""
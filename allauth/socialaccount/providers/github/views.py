@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+from functools import partial
 from http import HTTPStatus
 
 from django.http import HttpRequest
 
 from allauth.socialaccount import app_settings
 from allauth.socialaccount.adapter import get_adapter
+from allauth.socialaccount.providers.oauth2.fanout import fan_out
 from allauth.socialaccount.providers.oauth2.views import (
     OAuth2Adapter,
     OAuth2CallbackView,
@@ -31,14 +33,19 @@ class GitHubOAuth2Adapter(OAuth2Adapter):
 
     def complete_login(self, request: HttpRequest, app, token, **kwargs):
         headers = {"Authorization": f"token {token.token}"}
+        extra_data, emails = fan_out(
+            partial(self.get_profile, headers),
+            partial(self.get_emails, headers) if app_settings.QUERY_EMAIL else None,
+        )
+        if emails:
+            extra_data["emails"] = emails
+        return self.get_provider().sociallogin_from_response(request, extra_data)
+
+    def get_profile(self, headers) -> dict:
         with get_adapter().get_requests_session() as sess:
             resp = sess.get(self.profile_url, headers=headers)
             resp.raise_for_status()
-            extra_data = resp.json()
-        if app_settings.QUERY_EMAIL:
-            if emails := self.get_emails(headers):
-                extra_data["emails"] = emails
-        return self.get_provider().sociallogin_from_response(request, extra_data)
+            return resp.json()
 
     def get_emails(self, headers) -> list | None:
         with get_adapter().get_requests_session() as sess:
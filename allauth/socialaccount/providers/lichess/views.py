@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+from functools import partial
+
 from django.http import HttpRequest
 
 from allauth.socialaccount import app_settings
 from allauth.socialaccount.adapter import get_adapter
 from allauth.socialaccount.app_settings import QUERY_EMAIL
+from allauth.socialaccount.providers.oauth2.fanout import fan_out
 from allauth.socialaccount.providers.oauth2.views import (
     OAuth2Adapter,
     OAuth2CallbackView,
@@ -26,6 +29,17 @@ class LichessOAuth2Adapter(OAuth2Adapter):
 
     def complete_login(self, request: HttpRequest, app, token, **kwargs):
         headers = {"Authorization": f"Bearer {token.token}"}
+        extra_data, email = fan_out(
+            partial(self.get_profile, token, headers),
+            # retrieve email address if requested
+            partial(self.get_email, headers) if QUERY_EMAIL else None,
+        )
+        user_profile = extra_data["result"] if "result" in extra_data else extra_data
+        if email:
+            user_profile["email"] = email
+        return self.get_provider().sociallogin_from_response(request, user_profile)
+
+    def get_profile(self, token, headers) -> dict:
         with get_adapter().get_requests_session() as sess:
             profile_res = sess.get(
                 self.profile_url,
@@ -33,27 +47,15 @@ class LichessOAuth2Adapter(OAuth2Adapter):
                 headers=headers,
             )
             profile_res.raise_for_status()
-            extra_data = profile_res.json()
-
-            user_profile = (
-                extra_data["result"] if "result" in extra_data else extra_data
-            )
-
-            # retrieve email address if requested
-            if QUERY_EMAIL:
-                email_resp = sess.get(self.email_address_url, headers=headers)
-
-                email_resp.raise_for_status()
-                email_data = email_resp.json()
-
-                # extract email address from response
-
-                email = email_data.get("email", None)
+            return profile_res.json()
 
-                if email:
-                    user_profile["email"] = email
-
-        return self.get_provider().sociallogin_from_response(request, user_profile)
+    def get_email(self, headers) -> str | None:
+        with get_adapter().get_requests_session() as sess:
+            email_resp = sess.get(self.email_address_url, headers=headers)
+            email_resp.raise_for_status()
+            email_data = email_resp.json()
+        # extract email address from response
+        return email_data.get("email", None)
 
 
 oauth2_login = OAuth2LoginView.adapter_view(LichessOAuth2Adapter)
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+from functools import partial
+
 from django.http import HttpRequest
 
 from allauth.socialaccount import app_settings
 from allauth.socialaccount.adapter import get_adapter
+from allauth.socialaccount.providers.oauth2.fanout import fan_out
 from allauth.socialaccount.providers.oauth2.views import (
     OAuth2Adapter,
     OAuth2CallbackView,
@@ -30,22 +33,29 @@ class LinkedInOAuth2Adapter(OAuth2Adapter):
             **self.get_provider().get_settings().get("HEADERS", {}),
             "Authorization": f"Bearer {token.token}",
         }
+        url = f"{self.profile_url}?projection=({','.join(fields)})"
+        email_info, profile = fan_out(
+            partial(self.get_email_info, headers) if app_settings.QUERY_EMAIL else None,
+            partial(self.get_profile, url, headers),
+        )
+        info = email_info or {}
+        info.update(profile)
+        return info
 
-        info = {}
+    def get_email_info(self, headers) -> dict:
+        with get_adapter().get_requests_session() as sess:
+            resp = sess.get(self.email_url, headers=headers)
+            # If this response goes wrong, that is not a blocker in order to
+            # continue.
+            if resp.ok:
+                return resp.json()
+        return {}
+
+    def get_profile(self, url, headers) -> dict:
         with get_adapter().get_requests_session() as sess:
-            if app_settings.QUERY_EMAIL:
-                sess = get_adapter().get_requests_session()
-                resp = sess.get(self.email_url, headers=headers)
-                # If this response goes wrong, that is not a blocker in order to
-                # continue.
-                if resp.ok:
-                    info = resp.json()
-
-            url = f"{self.profile_url}?projection=({','.join(fields)})"
             resp = sess.get(url, headers=headers)
             resp.raise_for_status()
-            info.update(resp.json())
-        return info
+            return resp.json()
 
 
 oauth2_login = OAuth2LoginView.adapter_view(LinkedInOAuth2Adapter)
@@ -0,0 +1,95 @@
+"""
+Performs independent requests to a provider concurrently, e.g. fetching the
+user profile and the email addresses right after the token exchange, so that
+the latency of a login is bounded by the slowest request instead of by the sum
+of all of them.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from allauth.socialaccount import app_settings
+
+
+_lock = threading.Lock()
+_executors: dict[tuple[int, int], ThreadPoolExecutor] = {}
+_local = threading.local()
+
+
+@receiver(setting_changed)
+def _clear_executors(**kwargs) -> None:
+    with _lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=False)
+
+
+def get_executor() -> ThreadPoolExecutor | None:
+    max_workers = app_settings.REQUESTS_MAX_WORKERS
+    if not max_workers:
+        return None
+    # Threads do not survive a fork.
+    key = (os.getpid(), max_workers)
+    executor = _executors.get(key)
+    if executor is None:
+        with _lock:
+            executor = _executors.get(key)
+            if executor is None:
+                executor = ThreadPoolExecutor(
+                    max_workers=max_workers,
+                    thread_name_prefix="allauth-fan-out",
+                    initializer=_mark_worker,
+                )
+                _executors[key] = executor
+    return executor
+
+
+def _mark_worker() -> None:
+    _local.is_worker = True
+
+
+def fan_out(*calls: Callable[[], Any] | None) -> list[Any]:
+    """
+    Invokes the given calls concurrently, and returns their results, in order.
+    Calls that are ``None`` are skipped, their result being ``None``. If any
+    of the calls fails, the exception of the first failing call is raised.
+    """
+    pending = [call for call in calls if call is not None]
+    executor = get_executor()
+    if executor is None or len(pending) < 2 or getattr(_local, "is_worker", False):
+        # Nothing to gain, or, when already running in the pool, waiting on it
+        # could deadlock.
+        results = iter([call() for call in pending])
+    else:
+        # The first call is performed by the current thread, so that only the
+        # remaining calls require a worker. The context is copied so that e.g.
+        # the current request is available to the adapter methods.
+        futures = [
+            executor.submit(contextvars.copy_context().run, call)
+            for call in pending[1:]
+        ]
+        try:
+            values = [pending[0]()]
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+        for call, future in zip(pending[1:], futures):
+            # The pool is shared by all requests. Rather than waiting behind
+            # the calls of others, calls that have not started yet are
+            # performed by the current thread.
+            if future.cancel():
+                values.append(call())
+            else:
+                values.append(future.result())
+        results = iter(values)
+    return [None if call is None else next(results) for call in calls]
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+from functools import partial
+
 from django.http import Http404, HttpRequest
 from django.urls import reverse
 
 from allauth.account.internal.decorators import login_not_required
 from allauth.socialaccount.adapter import get_adapter
-from allauth.socialaccount.internal import jwtkit
+from allauth.socialaccount.internal import cachekit, jwtkit
 from allauth.socialaccount.models import SocialApp, SocialToken
+from allauth.socialaccount.providers.oauth2.fanout import fan_out
 from allauth.socialaccount.providers.oauth2.views import (
     OAuth2Adapter,
     OAuth2CallbackView,
@@ -24,10 +27,7 @@ class OpenIDConnectOAuth2Adapter(OAuth2Adapter):
     def openid_config(self):
         if not hasattr(self, "_openid_config"):
             server_url = self.get_provider().server_url
-            with get_adapter().get_requests_session() as sess:
-                resp = sess.get(server_url)
-                resp.raise_for_status()
-                self._openid_config = resp.json()
+            self._openid_config = cachekit.documents.get(server_url).data
         return self._openid_config
 
     @property
@@ -53,12 +53,18 @@ class OpenIDConnectOAuth2Adapter(OAuth2Adapter):
 
     def complete_login(self, request: HttpRequest, app, token: SocialToken, **kwargs):
         id_token_str = kwargs["response"].get("id_token")
-        fetch_userinfo = app.settings.get("fetch_userinfo", True)
+        fetch_userinfo = app.settings.get("fetch_userinfo", True) or not id_token_str
+        # Fetching the user info and the keys needed to verify the ID token
+        # are independent of each other.
+        userinfo, id_token = fan_out(
+            partial(self._fetch_user_info, token.token) if fetch_userinfo else None,
+            partial(self._decode_id_token, app, id_token_str) if id_token_str else None,
+        )
         data = {}
-        if fetch_userinfo or (not id_token_str):
-            data["userinfo"] = self._fetch_user_info(token.token)
+        if fetch_userinfo:
+            data["userinfo"] = userinfo
         if id_token_str:
-            data["id_token"] = self._decode_id_token(app, id_token_str)
+            data["id_token"] = id_token
         return self.get_provider().sociallogin_from_response(request, data)
 
     def _fetch_user_info(self, access_token: str) -> dict:
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import TypeVar
 
+from django.core.cache import DEFAULT_CACHE_ALIAS
+
 
 _T = TypeVar("_T")
 
@@ -29,6 +31,27 @@ class AppSettings:
         """
         return self._setting("TRACK_ACTIVITY", False)
 
+    @property
+    def CACHE_ALIAS(self) -> str | None:
+        """The cache used to remember sessions that were recently recorded,
+        avoiding a database query on each request.
+        """
+        return self._setting("CACHE_ALIAS", DEFAULT_CACHE_ALIAS)
+
+    @property
+    def TRACK_ACTIVITY_INTERVAL(self) -> int:
+        """The minimum number of seconds between two consecutive updates of
+        the last seen timestamp of a session.
+        """
+        return self._setting("TRACK_ACTIVITY_INTERVAL", 60)
+
+    @property
+    def TRACK_ACTIVITY_BUFFER_SIZE(self) -> int:
+        """When set, updates of the last seen timestamp are buffered, and
+        written in bulk.
+        """
+        return self._setting("TRACK_ACTIVITY_BUFFER_SIZE", 0)
+
 
 _app_settings = AppSettings("USERSESSIONS_")
 
@@ -1,3 +1,5 @@
+import atexit
+
 from django.apps import AppConfig
 from django.utils.translation import gettext_lazy as _
 
@@ -12,13 +14,18 @@ class UserSessionsConfig(AppConfig):
     )
 
     def ready(self) -> None:
+        from django.core.signals import request_finished
+
         from allauth.account.signals import (
             password_changed,
             password_set,
             user_logged_in,
         )
         from allauth.usersessions import signals
+        from allauth.usersessions.internal import activitykit
 
         user_logged_in.connect(receiver=signals.on_user_logged_in)
         for sig in [password_set, password_changed]:
             sig.connect(receiver=signals.on_password_changed)
+        request_finished.connect(receiver=activitykit.on_request_finished)
+        atexit.register(activitykit.flush_at_exit)
@@ -0,0 +1,145 @@
+"""
+Keeps the last seen timestamp of user sessions up to date. Writes are
+throttled (``USERSESSIONS_TRACK_ACTIVITY_INTERVAL``), and, optionally,
+buffered in memory so that they can be written in bulk
+(``USERSESSIONS_TRACK_ACTIVITY_BUFFER_SIZE``).
+
+Sessions that were recorded recently are remembered in the cache
+(``USERSESSIONS_CACHE_ALIAS``), so that, as long as the client does not
+change, requests do not need to hit the database at all.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Optional
+
+from django.core.cache import caches
+from django.db import DatabaseError
+
+from allauth.usersessions import app_settings
+
+
+if TYPE_CHECKING:
+    from allauth.usersessions.models import UserSession
+
+
+_lock = threading.Lock()
+# Maps the primary key of a session to its pending last seen timestamp.
+_pending: dict[int, datetime] = {}
+_pending_since: Optional[float] = None
+
+
+def _cache_key(session_key: str) -> str:
+    # Session keys are secrets, so they are not to end up in the cache as is.
+    digest = hashlib.sha256(session_key.encode("utf8")).hexdigest()
+    return f"allauth.usersessions.seen.{digest}"
+
+
+def seen_recently(session_key: str, client: list[str]) -> bool:
+    """
+    Whether or not the session was recorded, by the same client, less than
+    ``USERSESSIONS_TRACK_ACTIVITY_INTERVAL`` seconds ago.
+    """
+    alias = app_settings.CACHE_ALIAS
+    if not alias or not app_settings.TRACK_ACTIVITY_INTERVAL:
+        return False
+    return caches[alias].get(_cache_key(session_key)) == client
+
+
+def mark_seen(
+    session_key: str, client: list[str], last_seen_at: datetime, now: datetime
+) -> None:
+    alias = app_settings.CACHE_ALIAS
+    if not alias:
+        return
+    interval = timedelta(seconds=app_settings.TRACK_ACTIVITY_INTERVAL)
+    timeout = (last_seen_at + interval - now).total_seconds()
+    if timeout > 0:
+        caches[alias].set(_cache_key(session_key), client, timeout=timeout)
+
+
+def forget(session_key: str) -> None:
+    alias = app_settings.CACHE_ALIAS
+    if alias:
+        caches[alias].delete(_cache_key(session_key))
+
+
+def is_due(session: UserSession, now: datetime) -> bool:
+    """
+    Whether or not the last seen timestamp of the session is outdated enough to
+    warrant an update.
+    """
+    interval = timedelta(seconds=app_settings.TRACK_ACTIVITY_INTERVAL)
+    return now - session.last_seen_at >= interval
+
+
+def record_activity(session: UserSession) -> None:
+    """
+    Records the (already updated) last seen timestamp of the session.
+    """
+    global _pending_since
+    buffer_size = app_settings.TRACK_ACTIVITY_BUFFER_SIZE
+    if not buffer_size:
+        session.save(update_fields=["last_seen_at"])
+        return
+    with _lock:
+        _pending[session.pk] = session.last_seen_at
+        if _pending_since is None:
+            _pending_since = time.monotonic()
+        due = len(_pending) >= buffer_size or _is_overdue()
+    if due:
+        flush()
+
+
+def _is_overdue() -> bool:
+    return (
+        _pending_since is not None
+        and time.monotonic() - _pending_since >= app_settings.TRACK_ACTIVITY_INTERVAL
+    )
+
+
+def on_request_finished(**kwargs) -> None:
+    """
+    Requests that do not record any activity themselves still get the pending
+    updates written once these are overdue.
+    """
+    with _lock:
+        due = _is_overdue()
+    if due:
+        flush()
+
+
+def flush_at_exit() -> None:
+    try:
+        flush()
+    except DatabaseError:
+        # Nothing left to be done once the database is unavailable.
+        pass
+
+
+def discard(session: UserSession) -> None:
+    """
+    Drops the pending timestamp of a session that is about to be written
+    anyway, so that a later flush does not overwrite it with an older value.
+    """
+    with _lock:
+        _pending.pop(session.pk, None)
+
+
+def flush() -> None:
+    global _pending_since
+    from allauth.usersessions.models import UserSession
+
+    with _lock:
+        pending = dict(_pending)
+        _pending.clear()
+        _pending_since = None
+    if pending:
+        UserSession.objects.bulk_update(
+            [UserSession(pk=pk, last_seen_at=ts) for pk, ts in pending.items()],
+            ["last_seen_at"],
+        )
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from importlib import import_module
+from typing import Iterable
+
+from django.conf import settings
+from django.contrib.auth import (
+    BACKEND_SESSION_KEY,
+    HASH_SESSION_KEY,
+    SESSION_KEY,
+    load_backend,
+)
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.contrib.sessions.backends import cache as cache_backend, db as db_backend
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+
+from allauth.usersessions.internal import activitykit
+from allauth.usersessions.models import UserSession
+
+
+BATCH_SIZE = 500
+
+
+def load_sessions(session_keys: list[str]) -> dict[str, dict]:
+    """
+    Returns the data of the sessions that (still) exist, keyed by session key.
+    For the database and cache based session engines this is done in bulk,
+    other engines are queried session by session.
+    """
+    store_class = import_module(settings.SESSION_ENGINE).SessionStore
+    ret: dict[str, dict] = {}
+    for offset in range(0, len(session_keys), BATCH_SIZE):
+        batch = session_keys[offset : offset + BATCH_SIZE]
+        if issubclass(store_class, db_backend.SessionStore):
+            # Also covers ``cached_db``, for which the database is leading.
+            store = store_class()
+            rows = (
+                store_class.get_model_class()
+                .objects.filter(session_key__in=batch, expire_date__gt=timezone.now())
+                .values_list("session_key", "session_data")
+            )
+            for session_key, session_data in rows:
+                ret[session_key] = store.decode(session_data)
+        elif issubclass(store_class, cache_backend.SessionStore):
+            prefix = store_class.cache_key_prefix
+            cache = caches[settings.SESSION_CACHE_ALIAS]
+            data = cache.get_many([prefix + session_key for session_key in batch])
+            for cache_key, session_data in data.items():
+                ret[cache_key[len(prefix) :]] = session_data
+        else:
+            for session_key in batch:
+                store = store_class(session_key)
+                if store.exists(session_key):
+                    ret[session_key] = store.load()
+    return ret
+
+
+def is_authenticated_as(session_data: dict, user: AbstractBaseUser) -> bool:
+    """
+    Whether or not the session is an authenticated session of the given user.
+    Mirrors ``django.contrib.auth.get_user()``, without looking up the user.
+    """
+    try:
+        user_id = user._meta.pk.to_python(session_data[SESSION_KEY])
+        backend_path = session_data[BACKEND_SESSION_KEY]
+    except (KeyError, ValidationError):
+        return False
+    if user_id != user.pk or backend_path not in settings.AUTHENTICATION_BACKENDS:
+        return False
+    backend = load_backend(backend_path)
+    user_can_authenticate = getattr(backend, "user_can_authenticate", None)
+    if user_can_authenticate and not user_can_authenticate(user):
+        return False
+    if not hasattr(user, "get_session_auth_hash"):
+        return True
+    session_hash = session_data.get(HASH_SESSION_KEY)
+    if not session_hash:
+        return False
+    auth_hashes = [user.get_session_auth_hash()]
+    auth_hashes.extend(user.get_session_auth_fallback_hash())
+    return any(
+        constant_time_compare(session_hash, auth_hash) for auth_hash in auth_hashes
+    )
+
+
+def purge_sessions(
+    sessions: Iterable[UserSession], users: dict
+) -> tuple[list[UserSession], int]:
+    """
+    Deletes the user sessions of which the underlying session is gone, or no
+    longer authenticated as the user (as found in ``users``, keyed by primary
+    key). Returns the remaining sessions, and the number of deleted sessions.
+    """
+    sessions = list(sessions)
+    session_datas = load_sessions([session.session_key for session in sessions])
+    alive, dead = [], []
+    for session in sessions:
+        session_data = session_datas.get(session.session_key)
+        user = users.get(session.user_id)
+        if (
+            session_data is not None
+            and user is not None
+            and is_authenticated_as(session_data, user)
+        ):
+            alive.append(session)
+        else:
+            dead.append(session)
+    if dead:
+        UserSession.objects.filter(pk__in=[session.pk for session in dead]).delete()
+        for session in dead:
+            activitykit.forget(session.session_key)
+    return alive, len(dead)
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from allauth.usersessions.internal.sessionkit import BATCH_SIZE, purge_sessions
+from allauth.usersessions.models import UserSession
+
+
+class Command(BaseCommand):
+    help = "Deletes user sessions of which the underlying session has ended."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=BATCH_SIZE,
+            help="The number of user sessions to process at a time.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        batch_size = options["batch_size"]
+        user_manager = get_user_model()._default_manager
+        last_pk = None
+        total = purged = 0
+        while True:
+            sessions = UserSession.objects.order_by("pk")
+            if last_pk is not None:
+                sessions = sessions.filter(pk__gt=last_pk)
+            batch = list(sessions[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+            users = user_manager.in_bulk({session.user_id for session in batch})
+            _, count = purge_sessions(batch, users)
+            total += len(batch)
+            purged += count
+        self.stdout.write(f"Purged {purged} of {total} user sessions.")
@@ -3,9 +3,10 @@ from __future__ import annotations
 from importlib import import_module
 
 from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.contrib.auth.base_user import AbstractBaseUser
 from django.core.exceptions import ImproperlyConfigured
-from django.db import models, transaction
+from django.db import models
 from django.http import HttpRequest
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
@@ -25,11 +26,13 @@ if not allauth_settings.USERSESSIONS_ENABLED:
 
 class UserSessionManager(models.Manager):
     def purge_and_list(self, user: AbstractBaseUser) -> list["UserSession"]:
-        ret = []
+        from allauth.usersessions.internal.sessionkit import purge_sessions
+
         sessions = UserSession.objects.filter(user_id=user.pk)
-        for session in sessions.iterator():
-            if not session.purge():
-                ret.append(session)
+        # The user instance passed might be outdated (e.g. a password change),
+        # so, just like ``django.contrib.auth`` does, fetch it afresh.
+        users = get_user_model()._default_manager.in_bulk([user.pk])
+        ret, _ = purge_sessions(sessions, users)
         return ret
 
     def create_from_request(self, request: HttpRequest) -> None:
@@ -41,39 +44,61 @@ class UserSessionManager(models.Manager):
             0 : UserSession._meta.get_field("user_agent").max_length
         ]
 
-        defaults = dict(
-            user=request.user,
-            ip=get_adapter().get_client_ip(request),
-            user_agent=ua,
-        )
+        ip = get_adapter().get_client_ip(request)
 
-        from_session = None
-        with transaction.atomic():
-            from allauth.usersessions.signals import session_client_changed
+        from allauth.usersessions.internal import activitykit
+        from allauth.usersessions.signals import session_client_changed
 
-            session, created = UserSession.objects.get_or_create(
-                session_key=request.session.session_key, defaults=defaults
-            )
+        session_key = request.session.session_key
+        assert session_key  # nosec
+        client = [str(request.user.pk), ip, ua]
+        if activitykit.seen_recently(session_key, client):
+            return
 
-            if not created:
-                from_session = UserSession(
-                    session_key=session.session_key,
-                    user=session.user,
-                    ip=session.ip,
-                    user_agent=session.user_agent,
-                    data=session.data,
-                    created_at=session.created_at,
-                    last_seen_at=session.last_seen_at,
-                )
-                # Update session
-                session.user = defaults["user"]
-                session.ip = defaults["ip"]
-                session.user_agent = defaults["user_agent"]
-                session.last_seen_at = timezone.now()
-
-                session.save()
-
-        if from_session and (
+        now = timezone.now()
+        session, created = UserSession.objects.get_or_create(
+            session_key=session_key,
+            defaults=dict(user=request.user, ip=ip, user_agent=ua, last_seen_at=now),
+        )
+        if created:
+            activitykit.mark_seen(session_key, client, now, now)
+            return
+
+        update_fields = []
+        if session.user_id != request.user.pk:
+            update_fields.append("user")
+        if session.ip != ip:
+            update_fields.append("ip")
+        if session.user_agent != ua:
+            update_fields.append("user_agent")
+        if not update_fields:
+            # Only the last seen timestamp moved, which is not worth a write
+            # on each and every request.
+            if activitykit.is_due(session, now):
+                session.last_seen_at = now
+                activitykit.record_activity(session)
+            activitykit.mark_seen(session_key, client, session.last_seen_at, now)
+            return
+
+        from_session = UserSession(
+            session_key=session.session_key,
+            user=session.user,
+            ip=session.ip,
+            user_agent=session.user_agent,
+            data=session.data,
+            created_at=session.created_at,
+            last_seen_at=session.last_seen_at,
+        )
+        # Update session
+        session.user = request.user
+        session.ip = ip
+        session.user_agent = ua
+        session.last_seen_at = now
+        activitykit.discard(session)
+        session.save(update_fields=update_fields + ["last_seen_at"])
+        activitykit.mark_seen(session_key, client, now, now)
+
+        if (
             from_session.ip != session.ip
             or from_session.user_agent != session.user_agent
         ):
@@ -121,11 +146,20 @@ class UserSession(models.Model):
             return True
         return False
 
+    def delete(self, *args, **kwargs):
+        from allauth.usersessions.internal import activitykit
+
+        activitykit.forget(self.session_key)
+        return super().delete(*args, **kwargs)
+
     def is_current(self) -> bool:
         return self.session_key == context.request.session.session_key
 
     def end(self) -> None:
+        from allauth.usersessions.signals import session_ended
+
         engine = import_module(settings.SESSION_ENGINE)
         store = engine.SessionStore()
         store.delete(self.session_key)
         self.delete()
+        session_ended.send(sender=UserSession, session=self)
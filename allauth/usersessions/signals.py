@@ -12,6 +12,12 @@ from .models import UserSession
 # - to_session: UserSession
 session_client_changed = Signal()
 
+# Emitted when a session is ended, e.g. when the user ends it from the list of
+# sessions.
+# Arguments:
+# - session: UserSession
+session_ended = Signal()
+
 
 def on_user_logged_in(sender, **kwargs) -> None:
     request = kwargs["request"]
@@ -1,9 +1,24 @@
+import time
+from unittest.mock import Mock, patch
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management import call_command
+
 import pytest
 
 from allauth.core.internal import ratelimit
 
 
-def test_rollback_consume(rf, enable_cache):
+@pytest.fixture(params=["cache", "local"])
+def rate_limit_backend(request, settings, enable_cache):
+    settings.ALLAUTH_RATE_LIMIT_BACKEND = request.param
+    backend = ratelimit.get_backend()
+    if isinstance(backend, ratelimit.LocalBackend):
+        backend.reset()
+    return backend
+
+
+def test_rollback_consume(rf, rate_limit_backend):
     def consume():
         request = rf.post("/")
         config = {"foo": "2/m/ip"}
@@ -38,3 +53,244 @@ def test_parse(rate, values):
         assert rate.amount == values[i][0]
         assert rate.duration == values[i][1]
         assert rate.per == values[i][2]
+
+
+def test_dry_run_does_not_consume(rf, rate_limit_backend):
+    request = rf.post("/")
+    config = {"foo": "1/m/ip"}
+    usage = ratelimit.consume(request, config=config, action="foo", dry_run=True)
+    assert usage
+    usage.rollback()
+    assert ratelimit.consume(request, config=config, action="foo")
+    assert not ratelimit.consume(request, config=config, action="foo", dry_run=True)
+
+
+def test_clear(rf, rate_limit_backend):
+    request = rf.post("/")
+    config = {"foo": "1/m/key"}
+    assert ratelimit.consume(request, config=config, action="foo", key="k")
+    assert not ratelimit.consume(request, config=config, action="foo", key="k")
+    ratelimit.clear(request, config=config, action="foo", key="k")
+    assert ratelimit.consume(request, config=config, action="foo", key="k")
+
+
+def test_window_expires(rf, rate_limit_backend):
+    request = rf.post("/")
+    config = {"foo": "1/m/ip"}
+    now = 1_000_000.0
+    with patch("time.time", return_value=now):
+        assert ratelimit.consume(request, config=config, action="foo")
+        assert not ratelimit.consume(request, config=config, action="foo")
+    with patch("time.time", return_value=now + 61):
+        assert ratelimit.consume(request, config=config, action="foo")
+
+
+def test_default_backend(settings, enable_cache):
+    settings.ALLAUTH_RATE_LIMIT_BACKEND = None
+    assert isinstance(ratelimit.get_backend(), ratelimit.CacheBackend)
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": "redis://127.0.0.1:6379",
+        }
+    }
+    assert isinstance(ratelimit.get_backend(), ratelimit.RedisBackend)
+
+
+def test_all_or_nothing(rf, rate_limit_backend):
+    request = rf.post("/")
+    config = {"foo": "2/m/ip,1/m/key"}
+    assert ratelimit.consume(request, config=config, action="foo", key="a")
+    # Rejected by the key rate, must not consume the IP rate.
+    assert not ratelimit.consume(request, config=config, action="foo", key="a")
+    assert ratelimit.consume(request, config=config, action="foo", key="b")
+    assert not ratelimit.consume(request, config=config, action="foo", key="c")
+
+
+def test_cache_backend_rejection_does_not_write(rf, settings, enable_cache):
+    settings.ALLAUTH_RATE_LIMIT_BACKEND = "cache"
+    request = rf.post("/")
+    config = {"foo": "1/m/ip,1/m/key"}
+    assert ratelimit.consume(request, config=config, action="foo", key="a")
+    with (
+        patch.object(LocMemCache, "incr", side_effect=AssertionError),
+        patch.object(LocMemCache, "add", side_effect=AssertionError),
+    ):
+        assert not ratelimit.consume(request, config=config, action="foo", key="b")
+
+
+def test_cache_backend_without_atomic_incr(rf, settings, db):
+    settings.ALLAUTH_RATE_LIMIT_BACKEND = "cache"
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "allauth_ratelimit",
+        }
+    }
+    call_command("createcachetable")
+    request = rf.post("/")
+    config = {"foo": "2/m/ip,1/h/key"}
+    # Windows are aligned to the clock, stay clear from window boundaries.
+    now = (time.time() // 3600) * 3600 + 1
+    with patch("time.time", return_value=now):
+        usage = ratelimit.consume(request, config=config, action="foo", key="a")
+        assert usage
+        assert not ratelimit.consume(request, config=config, action="foo", key="a")
+        usage.rollback()
+        assert ratelimit.consume(request, config=config, action="foo", key="a")
+        assert ratelimit.consume(request, config=config, action="foo", key="b")
+        assert not ratelimit.consume(request, config=config, action="foo", key="c")
+
+
+def test_cache_backend_without_atomic_incr_rollback_keeps_window(rf, settings, db):
+    settings.ALLAUTH_RATE_LIMIT_BACKEND = "cache"
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "allauth_ratelimit",
+            "TIMEOUT": None,
+        }
+    }
+    call_command("createcachetable")
+    request = rf.post("/")
+    config = {"foo": "2/m/ip"}
+    now = (time.time() // 60) * 60 + 10
+    with patch("time.time", return_value=now):
+        ratelimit.consume(request, config=config, action="foo")
+        usage = ratelimit.consume(request, config=config, action="foo")
+        (token,) = [u.token for u in usage.usage]
+        with patch.object(
+            ratelimit._get_cache(), "set", wraps=ratelimit._get_cache().set
+        ) as set_m:
+            usage.rollback()
+    set_m.assert_called_once_with(token, 1, 50)
+
+
+def test_rate_plan_is_compiled_once():
+    config = {"foo": "5/m/ip,20/h/key"}
+    plan = ratelimit.get_rate_plan(config, "foo")
+    assert plan.rates == (
+        ratelimit.Rate(5, 60, "ip"),
+        ratelimit.Rate(20, 3600, "key"),
+    )
+    assert plan.cache_key_prefix == "allauth:rl2:foo"
+    with patch.object(ratelimit, "parse_rates", side_effect=AssertionError):
+        assert ratelimit.get_rate_plan(config, "foo") is plan
+
+
+def test_rate_limits_follow_settings(settings):
+    from allauth.account import app_settings
+
+    settings.ACCOUNT_RATE_LIMITS = {"signup": "1/m/ip"}
+    assert app_settings.RATE_LIMITS["signup"] == "1/m/ip"
+    assert app_settings.RATE_LIMITS is app_settings.RATE_LIMITS
+    settings.ACCOUNT_RATE_LIMITS = {"signup": "2/m/ip"}
+    assert app_settings.RATE_LIMITS["signup"] == "2/m/ip"
+
+
+def test_legacy_cache_entries_are_ignored(rf, settings, enable_cache):
+    from django.core.cache import cache
+
+    settings.ALLAUTH_RATE_LIMIT_BACKEND = "cache"
+    request = rf.post("/")
+    # Previously, a list of timestamps was stored.
+    cache.set("allauth:rl:foo:ip:127.0.0.1", [time.time()])
+    config = {"foo": "1/m/ip"}
+    assert ratelimit.consume(request, config=config, action="foo")
+    assert not ratelimit.consume(request, config=config, action="foo")
+
+
+def test_local_backend_prunes_history(rf, settings):
+    settings.ALLAUTH_RATE_LIMIT_BACKEND = "local"
+    backend = ratelimit.get_backend()
+    backend.reset()
+    request = rf.post("/")
+    config = {"foo": "2/m/ip,3/h/ip"}
+    now = 1_000_000.0
+    for i in range(3):
+        with patch("time.time", return_value=now + i * 61):
+            assert ratelimit.consume(request, config=config, action="foo")
+    with patch("time.time", return_value=now + 123):
+        assert not ratelimit.consume(request, config=config, action="foo")
+    assert sorted(len(history) for history in backend._history.values()) == [1, 3]
+    with patch("time.time", return_value=now + 3600 + 122):
+        assert ratelimit.consume(request, config=config, action="foo")
+    assert sorted(len(history) for history in backend._history.values()) == [1, 1]
+
+
+def test_rates_of_the_same_kind_are_consumed_once(rf, rate_limit_backend):
+    request = rf.post("/")
+    config = {"foo": "2/m/ip,3/h/ip"}
+    assert ratelimit.consume(request, config=config, action="foo")
+    assert ratelimit.consume(request, config=config, action="foo")
+    assert not ratelimit.consume(request, config=config, action="foo")
+
+
+class FakeRedis:
+    """
+    Mimics the Lua script of the Redis backend, using Python sorted sets.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.scripts = []
+
+    def register_script(self, script):
+        self.scripts.append(script)
+        return self.run_script
+
+    def run_script(self, keys, args, client):
+        assert client is self
+        now, member = args[0], args[1]
+        for i, key in enumerate(keys):
+            duration, amount = args[2 + 2 * i], args[3 + 2 * i]
+            zset = self.data.setdefault(key, {})
+            for m, score in list(zset.items()):
+                if score <= now - duration:
+                    del zset[m]
+            if len(zset) >= amount:
+                return 0
+        if member:
+            for key in keys:
+                self.data[key][member] = now
+        return 1
+
+    def pipeline(self, transaction):
+        pipeline = Mock()
+        pipeline.zrem.side_effect = lambda key, member: self.data[key].pop(member)
+        return pipeline
+
+
+def test_redis_backend(rf, settings):
+    settings.CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": "redis://127.0.0.1:6379",
+        }
+    }
+    settings.ALLAUTH_RATE_LIMIT_BACKEND = None
+    backend = ratelimit.RedisBackend()
+    client = FakeRedis()
+    request = rf.post("/")
+    config = {"foo": "2/m/ip,1/m/key"}
+    with (
+        patch.object(ratelimit, "get_backend", return_value=backend),
+        patch.object(backend, "_get_client", return_value=client),
+    ):
+        usage = ratelimit.consume(request, config=config, action="foo", key="a")
+        assert usage
+        assert not ratelimit.consume(request, config=config, action="foo", key="a")
+        usage.rollback()
+        assert ratelimit.consume(request, config=config, action="foo", key="a")
+        assert ratelimit.consume(request, config=config, action="foo", key="b")
+        # The IP rate is exhausted, nothing is consumed for key "c".
+        assert not ratelimit.consume(request, config=config, action="foo", key="c")
+        assert (
+            ratelimit.consume(
+                request, config=config, action="foo", key="c", dry_run=True
+            )
+            is None
+        )
+    assert client.scripts == [ratelimit.RedisBackend.SCRIPT]
+    assert all(":1:allauth:rl2:foo:" in key for key in client.data)
+    assert sorted(len(zset) for zset in client.data.values()) == [1, 1, 2]
@@ -11,3 +11,13 @@ def test_config(db, client, headless_reverse):
         "socialaccount",
         "usersessions",
     }
+
+
+def test_config_not_modified(db, client, headless_reverse):
+    resp = client.get(headless_reverse("headless:config"))
+    etag = resp["ETag"]
+    resp = client.get(headless_reverse("headless:config"), HTTP_IF_NONE_MATCH=etag)
+    assert resp.status_code == HTTPStatus.NOT_MODIFIED
+    assert resp.content == b""
+    resp = client.get(headless_reverse("headless:config"), HTTP_IF_NONE_MATCH='"x"')
+    assert resp.status_code == HTTPStatus.OK
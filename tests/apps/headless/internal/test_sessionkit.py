@@ -0,0 +1,38 @@
+from allauth.headless.internal.sessionkit import lookup_session, session_store
+
+
+def test_lookup_session(db, session_engine):
+    session = session_store()
+    session["foo"] = "bar"
+    session.save()
+    found = lookup_session(session.session_key)
+    assert found is not None
+    assert found.session_key == session.session_key
+    assert found["foo"] == "bar"
+
+
+def test_lookup_session_missing(db, session_engine):
+    session = session_store()
+    session["foo"] = "bar"
+    session.save()
+    session_key = session.session_key
+    session.delete()
+    assert lookup_session(session_key) is None
+    assert lookup_session("x" * 32) is None
+
+
+def test_lookup_session_expired(db, session_engine):
+    session = session_store()
+    session["foo"] = "bar"
+    session.set_expiry(-1)
+    session.save()
+    assert lookup_session(session.session_key) is None
+
+
+def test_lookup_session_single_query(db, settings, django_assert_num_queries):
+    settings.SESSION_ENGINE = "django.contrib.sessions.backends.db"
+    session = session_store()
+    session["foo"] = "bar"
+    session.save()
+    with django_assert_num_queries(1):
+        assert lookup_session(session.session_key)["foo"] == "bar"
@@ -2,13 +2,14 @@ import json
 from http import HTTPStatus
 from unittest.mock import patch
 
+from django.contrib.sites.models import Site
 from django.urls import reverse
 
 from pytest_django.asserts import assertTemplateUsed
 
 from allauth.account.models import EmailAddress
 from allauth.socialaccount.adapter import get_adapter
-from allauth.socialaccount.models import SocialAccount
+from allauth.socialaccount.models import SocialAccount, SocialApp
 from allauth.socialaccount.providers.base.constants import AuthProcess
 
 
@@ -525,3 +526,19 @@ def test_valid_openid_connect_token(
             )
             assert resp.status_code == HTTPStatus.OK
             assert SocialAccount.objects.filter(uid="123").exists()
+
+
+def test_config_providers_memoized(db, client, headless_reverse):
+    def get_provider_ids():
+        resp = client.get(headless_reverse("headless:config"))
+        providers = resp.json()["data"]["socialaccount"]["providers"]
+        return {provider["id"] for provider in providers}
+
+    provider_ids = get_provider_ids()
+    with patch.object(
+        type(get_adapter()), "list_providers", side_effect=AssertionError
+    ):
+        assert get_provider_ids() == provider_ids
+    app = SocialApp.objects.create(provider="google", client_id="id")
+    app.sites.add(Site.objects.get_current())
+    assert get_provider_ids() == provider_ids | {"google"}
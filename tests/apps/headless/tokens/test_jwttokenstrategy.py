@@ -1,4 +1,6 @@
+import time
 from http import HTTPStatus
+from unittest.mock import patch
 
 from django.test.client import Client
 from django.urls import reverse, reverse_lazy
@@ -327,3 +329,162 @@ def test_hs256_fallback_to_secret_key(
         options={"verify_signature": True, "verify_iss": False, "verify_aud": False},
     )
     assert payload["sub"] == str(user.pk)
+
+
+def test_key_material_is_loaded_once(settings):
+    from allauth.headless.tokens.strategies.jwt import internal
+
+    settings.HEADLESS_JWT_ALGORITHM = "RS256"
+    token, _ = internal.create_token("access", sub="1", sid="s", expires_in=60)
+    with patch.object(internal.jwkkit, "load_jwk_from_pem", side_effect=AssertionError):
+        assert internal.decode_token(token, "access")["sub"] == "1"
+    settings.HEADLESS_JWT_ALGORITHM = "HS256"
+    settings.HEADLESS_JWT_PRIVATE_KEY = "super-secret"
+    assert internal.decode_token(token, "access") is None
+
+
+@pytest.fixture
+def revocation_cache(settings, enable_cache):
+    settings.HEADLESS_TOKEN_STRATEGY = (
+        "allauth.headless.tokens.strategies.jwt.JWTTokenStrategy"
+    )
+    settings.HEADLESS_JWT_REVOCATION_CACHE_ALIAS = "default"
+
+
+def test_revoked_on_logout(
+    headless_client,
+    headless_reverse,
+    client,
+    obtain_tokens,
+    revocation_cache,
+    django_assert_num_queries,
+):
+    if headless_client == "browser":
+        return
+    access_token, _ = obtain_tokens(client)
+    url = reverse("headless_rest_framework_resource")
+    with django_assert_num_queries(0):
+        resp = Client(HTTP_AUTHORIZATION=f"Bearer {access_token}").get(url)
+    assert resp.status_code == HTTPStatus.OK
+
+    at_client = Client(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+    resp = at_client.delete(headless_reverse("headless:account:current_session"))
+    assert resp.status_code == HTTPStatus.UNAUTHORIZED
+
+    resp = Client(HTTP_AUTHORIZATION=f"Bearer {access_token}").get(url)
+    assert resp.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_revoked_on_password_change(
+    headless_client,
+    headless_reverse,
+    client,
+    user_password,
+    obtain_tokens,
+    revocation_cache,
+):
+    if headless_client == "browser":
+        return
+    access_token, _ = obtain_tokens(client)
+    other_access_token, _ = obtain_tokens(Client())
+
+    at_client = Client(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+    # Tokens issued in the second of revocation are not revoked.
+    with patch("allauth.headless.internal.revocationkit.time") as time_mock:
+        time_mock.time.return_value = time.time() + 1
+        resp = at_client.post(
+            headless_reverse("headless:account:change_password"),
+            data={"current_password": user_password, "new_password": "N3wPassw0rd!"},
+            content_type="application/json",
+        )
+    assert resp.status_code == HTTPStatus.OK
+
+    url = reverse("headless_rest_framework_resource")
+    for token in [access_token, other_access_token]:
+        resp = Client(HTTP_AUTHORIZATION=f"Bearer {token}").get(url)
+        assert resp.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_login_right_after_revocation(
+    headless_client, user, client, obtain_tokens, revocation_cache
+):
+    from allauth.headless.internal import revocationkit
+
+    if headless_client == "browser":
+        return
+    now = int(time.time()) + 0.6
+    with patch("time.time", return_value=now):
+        revocationkit.revoke_user(user)
+        access_token, _ = obtain_tokens(client)
+    resp = Client(HTTP_AUTHORIZATION=f"Bearer {access_token}").get(
+        reverse("headless_rest_framework_resource")
+    )
+    assert resp.status_code == HTTPStatus.OK
+
+
+def test_access_token_validated_once(
+    headless_client, headless_reverse, client, settings, obtain_tokens
+):
+    from allauth.headless.tokens.strategies.jwt import internal
+
+    if headless_client == "browser":
+        return
+    settings.HEADLESS_TOKEN_STRATEGY = (
+        "allauth.headless.tokens.strategies.jwt.JWTTokenStrategy"
+    )
+    access_token, _ = obtain_tokens(client)
+    at_client = Client(HTTP_AUTHORIZATION=f"Bearer {access_token}")
+    with patch.object(
+        internal, "validate_access_token", wraps=internal.validate_access_token
+    ) as validate_access_token:
+        resp = at_client.get(headless_reverse("headless:account:current_session"))
+    assert resp.status_code == HTTPStatus.OK
+    assert validate_access_token.call_count == 1
+
+
+def test_refresh_token_state_is_pruned(settings, db, user):
+    from allauth.headless.internal.sessionkit import new_session
+    from allauth.headless.tokens.strategies.jwt import internal
+
+    settings.HEADLESS_JWT_MAX_REFRESH_TOKENS = 2
+    session = new_session()
+    session.save()
+    internal.save_refresh_token_state(session, {"expired": 1})
+    tokens = [internal.create_refresh_token(user, session) for _ in range(3)]
+    state = session[internal.REFRESH_TOKEN_STATE_SESSION_KEY]
+    assert len(state) == 2
+    assert "expired" not in state
+    assert internal.validate_refresh_token(tokens[0]) is None
+
+
+@pytest.mark.parametrize("rotate", [False, True])
+def test_refresh_token_state_in_cache(
+    headless_client,
+    headless_reverse,
+    client,
+    settings,
+    enable_cache,
+    obtain_tokens,
+    rotate,
+):
+    if headless_client == "browser":
+        return
+    settings.HEADLESS_TOKEN_STRATEGY = (
+        "allauth.headless.tokens.strategies.jwt.JWTTokenStrategy"
+    )
+    settings.HEADLESS_JWT_REFRESH_TOKEN_CACHE_ALIAS = "default"
+    settings.HEADLESS_JWT_ROTATE_REFRESH_TOKEN = rotate
+    _, refresh_token = obtain_tokens(client)
+    assert "headless_refresh_tokens" not in client.headless_session()
+    resp = Client().post(
+        headless_reverse("headless:tokens:refresh"),
+        data={"refresh_token": refresh_token},
+        content_type="application/json",
+    )
+    assert resp.status_code == HTTPStatus.OK
+    resp = Client().post(
+        headless_reverse("headless:tokens:refresh"),
+        data={"refresh_token": refresh_token},
+        content_type="application/json",
+    )
+    assert resp.status_code == (HTTPStatus.BAD_REQUEST if rotate else HTTPStatus.OK)
@@ -12,6 +12,7 @@ from allauth.idp.oidc.adapter import get_adapter
 from allauth.idp.oidc.internal.oauthlib.request_validator import (
     OAuthLibRequestValidator,
 )
+from allauth.idp.oidc.internal.oauthlib.server import generate_jwt_access_token
 from allauth.idp.oidc.models import Client, Token
 
 
@@ -81,6 +82,19 @@ def access_token_generator():
     return f
 
 
+@pytest.fixture
+def jwt_access_token_generator(rf, settings):
+    settings.IDP_OIDC_ACCESS_TOKEN_FORMAT = "jwt"
+    settings.IDP_OIDC_ACCESS_TOKEN_LOCAL_VALIDATION_ENABLED = True
+
+    def f(client, user, scopes=["openid"]):
+        with request_context(rf.get("/")):
+            request = SimpleNamespace(client=client, user=user, scopes=scopes)
+            return generate_jwt_access_token(request)
+
+    return f
+
+
 @pytest.fixture
 def refresh_token_factory():
     def f(*, user, client, scopes=None):
@@ -32,3 +32,24 @@ def test_resource_user_inactive(db, client, access_token_generator, user, oidc_c
     )
     resp = client.get("/idp/ninja/resource", HTTP_AUTHORIZATION=f"bearer {token}")
     assert resp.status_code == HTTPStatus.UNAUTHORIZED
+
+
+def test_resource_jwt_validated_locally(
+    db, client, jwt_access_token_generator, user, oidc_client
+):
+    token = jwt_access_token_generator(
+        client=oidc_client, user=user, scopes=["view-resource"]
+    )
+    resp = client.get("/idp/ninja/resource", HTTP_AUTHORIZATION=f"bearer {token}")
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.json()["user_email"] == user.email
+
+
+def test_resource_jwt_forbidden(
+    db, client, jwt_access_token_generator, user, oidc_client
+):
+    token = jwt_access_token_generator(
+        client=oidc_client, user=user, scopes=["other-resource"]
+    )
+    resp = client.get("/idp/ninja/resource", HTTP_AUTHORIZATION=f"bearer {token}")
+    assert resp.status_code == HTTPStatus.UNAUTHORIZED
@@ -1,7 +1,13 @@
 from http import HTTPStatus
 
+from django.core.cache import cache
 from django.urls import reverse
 
+import pytest
+
+from allauth.idp.oidc.adapter import get_adapter
+from allauth.idp.oidc.internal.oauthlib import access_tokens
+
 
 def test_resource(db, client, access_token_generator, user, oidc_client):
     token, _ = access_token_generator(
@@ -33,3 +39,82 @@ def test_resource_forbidden(db, client, access_token_generator, user, oidc_clien
         reverse("idp_rest_framework_resource"), HTTP_AUTHORIZATION=f"bearer {token}"
     )
     assert resp.status_code == HTTPStatus.FORBIDDEN
+
+
+def test_resource_cached(
+    db,
+    client,
+    access_token_generator,
+    user,
+    oidc_client,
+    oidc_client_secret,
+    settings,
+    enable_cache,
+    django_assert_num_queries,
+):
+    settings.IDP_OIDC_ACCESS_TOKEN_CACHE_ALIAS = "default"
+    token, _ = access_token_generator(
+        client=oidc_client, user=user, scopes=["view-resource"]
+    )
+    url = reverse("idp_rest_framework_resource")
+    with django_assert_num_queries(1):
+        resp = client.get(url, HTTP_AUTHORIZATION=f"bearer {token}")
+    assert resp.status_code == HTTPStatus.OK
+    with django_assert_num_queries(0):
+        resp = client.get(url, HTTP_AUTHORIZATION=f"bearer {token}")
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.json()["user_email"] == user.email
+    cached = cache.get(access_tokens.cache_key(get_adapter().hash_token(token)))
+    assert "password" not in cached.user.__dict__
+    assert "secret" not in cached.client.__dict__
+
+    resp = client.post(
+        reverse("idp:oidc:revoke"),
+        data={
+            "client_id": oidc_client.id,
+            "client_secret": oidc_client_secret,
+            "token": token,
+        },
+    )
+    assert resp.status_code == HTTPStatus.OK
+    resp = client.get(url, HTTP_AUTHORIZATION=f"bearer {token}")
+    assert resp.status_code == HTTPStatus.FORBIDDEN
+
+
+@pytest.mark.parametrize("cache_max_age", [60, 0])
+def test_resource_jwt_validated_locally(
+    cache_max_age,
+    db,
+    client,
+    jwt_access_token_generator,
+    user,
+    oidc_client,
+    oidc_client_secret,
+    settings,
+    enable_cache,
+    django_assert_num_queries,
+):
+    settings.IDP_OIDC_ACCESS_TOKEN_CACHE_ALIAS = "default"
+    # Revocations are tracked, even when validated tokens are not cached.
+    settings.IDP_OIDC_ACCESS_TOKEN_CACHE_MAX_AGE = cache_max_age
+    token = jwt_access_token_generator(
+        client=oidc_client, user=user, scopes=["view-resource"]
+    )
+    url = reverse("idp_rest_framework_resource")
+    # Only the user is loaded, as the view accesses it.
+    with django_assert_num_queries(1):
+        resp = client.get(url, HTTP_AUTHORIZATION=f"bearer {token}")
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.json()["user_email"] == user.email
+
+    resp = client.post(
+        reverse("idp:oidc:revoke"),
+        data={
+            "client_id": oidc_client.id,
+            "client_secret": oidc_client_secret,
+            "token": token,
+        },
+    )
+    assert resp.status_code == HTTPStatus.OK
+    resp = client.get(url, HTTP_AUTHORIZATION=f"bearer {token}")
+    assert resp.status_code == HTTPStatus.FORBIDDEN
@@ -0,0 +1,47 @@
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from allauth.idp.oidc.internal.keyring import get_keyring
+from allauth.idp.oidc.internal.tokens import decode_jwt_token
+
+
+def _generate_pem() -> str:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    return private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    ).decode()
+
+
+def test_keyring_is_loaded_once():
+    assert get_keyring() is get_keyring()
+
+
+@pytest.mark.parametrize("public", [False, True])
+def test_key_rotation(settings, public):
+    old_pem = settings.IDP_OIDC_PRIVATE_KEY
+    if public:
+        old_pem = (
+            serialization.load_pem_private_key(old_pem.encode(), password=None)
+            .public_key()
+            .public_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PublicFormat.SubjectPublicKeyInfo,
+            )
+            .decode()
+        )
+    token = get_keyring().sign({"sub": "42"})
+
+    settings.IDP_OIDC_PRIVATE_KEY = _generate_pem()
+    assert decode_jwt_token(token, verify_exp=False, verify_iss=False) is None
+
+    settings.IDP_OIDC_VERIFICATION_KEYS = [old_pem]
+    keyring = get_keyring()
+    assert len(keyring.keys) == 2
+    assert decode_jwt_token(token, verify_exp=False, verify_iss=False) == {"sub": "42"}
+    new_token = keyring.sign({"sub": "43"})
+    assert decode_jwt_token(new_token, verify_exp=False, verify_iss=False) == {
+        "sub": "43"
+    }
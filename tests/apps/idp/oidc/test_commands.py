@@ -0,0 +1,39 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from allauth.idp.oidc.internal import purgekit
+from allauth.idp.oidc.models import Token
+
+
+def test_purge_tokens(db, oidc_client, user, access_token_generator):
+    _, valid = access_token_generator(oidc_client, user)
+    for _ in range(3):
+        _, instance = access_token_generator(oidc_client, user)
+        instance.expires_at = timezone.now() - timedelta(seconds=1)
+        instance.save()
+    call_command("oidc_purge_tokens", batch_size=2)
+    assert list(Token.objects.all()) == [valid]
+
+
+def test_purge_tokens_time_budget(db, oidc_client, user, access_token_generator):
+    _, instance = access_token_generator(oidc_client, user)
+    instance.expires_at = timezone.now() - timedelta(seconds=1)
+    instance.save()
+    stats = purgekit.purge_expired_tokens(time_budget=0)
+    assert stats.deleted == 0
+    assert not stats.complete
+    assert Token.objects.filter(pk=instance.pk).exists()
+
+
+def test_purge_periodically(db, settings, oidc_client, user, access_token_generator):
+    settings.IDP_OIDC_TOKEN_PURGE_INTERVAL = 60
+    with (
+        patch.object(purgekit, "_last_purged_at", None),
+        patch.object(purgekit, "purge_expired_tokens") as purge_expired_tokens,
+    ):
+        purgekit.purge_periodically()
+        purgekit.purge_periodically()
+    assert purge_expired_tokens.call_count == 1
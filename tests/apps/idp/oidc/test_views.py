@@ -177,6 +177,9 @@ def test_jwks_view(client):
     assert resp.json() == {
         "keys": [{"e": ANY, "key_ops": ["verify"], "kid": ANY, "kty": "RSA", "n": ANY}]
     }
+    assert "max-age" in resp["Cache-Control"]
+    resp = client.get(reverse("idp:oidc:jwks"), HTTP_IF_NONE_MATCH=resp["ETag"])
+    assert resp.status_code == HTTPStatus.NOT_MODIFIED
 
 
 @pytest.mark.parametrize("custom_userinfo_endpoint", [False, True])
@@ -125,3 +125,27 @@ def test_wildcard_to_regex():
 
     # verify dots aren't treated as wildcards
     assert not pattern.match("api$example$com")
+
+
+@pytest.mark.parametrize(
+    "uri,is_allowed",
+    [
+        ("https://a.example.com/callback", True),
+        ("https://b.example.com/callback?x=1&y=2", True),
+        ("https://b.example.com/callback?y=2", False),
+        ("https://b.example.com:8443/callback?x=1", False),
+        ("http://127.0.0.1:1234/cb", True),
+        ("https://c.d.example.com/callback", False),
+        ("https://other.org/callback", False),
+        ("myapp:/callback", True),
+        ("myapp:/other", False),
+    ],
+)
+def test_uri_matcher(uri, is_allowed):
+    allowed_uris = [
+        "https://a.example.com/callback",
+        "https://*.example.com/callback?x=1",
+        "http://127.0.0.1/cb",
+        "myapp:/callback",
+    ]
+    assert is_redirect_uri_allowed(uri, allowed_uris, True) == is_allowed
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from allauth.mfa.internal.flows import trust
 from allauth.mfa.models import Authenticator
 
@@ -50,3 +52,33 @@ def test_fingerprint_changes_on_authenticator_deletion(
     ).delete()
     fp2 = trust.create_config_fingerprint(user_with_totp)
     assert fp != fp2
+
+
+def test_cached_fingerprint(
+    user_with_totp, user_with_recovery_codes, password_factory, settings, enable_cache
+):
+    settings.MFA_TRUST_CACHE_ALIAS = "default"
+    fp = trust.create_config_fingerprint(user_with_totp)
+    with patch.object(trust, "_create_config_fingerprint") as m:
+        assert trust.create_config_fingerprint(user_with_totp) == fp
+        assert not m.called
+    assert fp == trust._create_config_fingerprint(user_with_totp)
+
+    # Recording usage keeps the cached fingerprint.
+    Authenticator.objects.get(
+        user=user_with_totp, type=Authenticator.Type.TOTP
+    ).record_usage()
+    with patch.object(trust, "_create_config_fingerprint") as m:
+        trust.create_config_fingerprint(user_with_totp)
+        assert not m.called
+
+    Authenticator.objects.filter(
+        user=user_with_totp, type=Authenticator.Type.RECOVERY_CODES
+    ).delete()
+    fp2 = trust.create_config_fingerprint(user_with_totp)
+    assert fp2 != fp
+
+    user_with_totp.set_password(password_factory())
+    fp3 = trust.create_config_fingerprint(user_with_totp)
+    assert fp3 not in (fp, fp2)
+    assert fp3 == trust._create_config_fingerprint(user_with_totp)
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 from allauth.mfa import app_settings
 from allauth.mfa.models import Authenticator
 from allauth.mfa.recovery_codes.internal.auth import RecoveryCodes
@@ -35,3 +37,33 @@ def test_migrated_codes(db, user):
     assert rc.get_unused_codes() == ["def"]
     rc.validate_code("def")
     assert rc.instance.data["migrated_codes"] == []
+
+
+def test_validate_code_uses_index(user):
+    rc = RecoveryCodes.activate(user)
+    codes = rc.generate_codes()
+    assert len(rc.instance.data["code_index"]["slots"]) == len(codes)
+    for code in codes:
+        assert code not in str(rc.instance.data["code_index"])
+    with patch.object(RecoveryCodes, "generate_codes") as m:
+        assert not rc.validate_code("bad")
+        assert rc.validate_code(codes[1])
+        assert not rc.validate_code(codes[1])
+        assert not m.called
+    rc = RecoveryCodes(Authenticator.objects.get(pk=rc.instance.pk))
+    assert rc._is_code_used(1)
+
+
+def test_validate_code_rebuilds_index(user, settings):
+    rc = RecoveryCodes.activate(user)
+    codes = rc.generate_codes()
+    del rc.instance.data["code_index"]
+    rc.instance.save()
+    assert rc.validate_code(codes[0])
+    settings.SECRET_KEY = "changed"
+    assert rc.validate_code(codes[2])
+    assert not rc.validate_code(codes[0])
+    rc = RecoveryCodes(Authenticator.objects.get(pk=rc.instance.pk))
+    assert rc.get_unused_codes() == [
+        code for i, code in enumerate(codes) if i not in (0, 2)
+    ]
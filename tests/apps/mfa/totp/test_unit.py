@@ -5,6 +5,7 @@ from allauth.mfa.totp.internal.auth import (
     format_hotp_value,
     generate_totp_secret,
     hotp_value,
+    match_totp_code,
     validate_totp_code,
     yield_hotp_counters_from_time,
 )
@@ -42,3 +43,13 @@ def test_validate_with_tolerance():
 
     two_after_value = format_hotp_value(hotp_value(test_secret, 57731623))
     assert not validate_totp_code(test_secret, two_after_value)
+
+
+@mock.patch("time.time", mock.MagicMock(return_value=1731948631))
+def test_match_totp_code():
+    app_settings.TOTP_TOLERANCE = 1
+    test_secret = "GEZDGNBVGY3TQOJQGEZDGNBVGY3TQOJQ"
+    code = format_hotp_value(hotp_value(test_secret, 57731620))
+    assert match_totp_code(test_secret, code) == 57731620
+    assert match_totp_code(test_secret, "000000") is None
+    app_settings.TOTP_TOLERANCE = 0
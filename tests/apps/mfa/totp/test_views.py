@@ -192,17 +192,17 @@ def test_cannot_deactivate_totp(auth_client, user_with_totp, user_password):
 def test_totp_code_reuse(
     user_with_totp, user_password, totp_validation_bypass, enable_cache
 ):
-    for code, time_lapse, expect_success in [
+    for counter, time_lapse, expect_success in [
         # First use of code, SUCCESS
-        ("123", False, True),
+        (100, False, True),
         # Second use, no time elapsed: FAIL
-        ("123", False, False),
-        # Different code, no time elapsed: SUCCESS
-        ("456", False, True),
+        (100, False, False),
+        # Code of a different period (tolerance), no time elapsed: SUCCESS
+        (101, False, True),
         # Again, previous code, no time elapsed: FAIL
-        ("123", False, False),
+        (100, False, False),
         # Previous code, but time elapsed: SUCCESS
-        ("123", True, True),
+        (100, True, True),
     ]:
         if time_lapse:
             cache.clear()
@@ -215,10 +215,11 @@ def test_totp_code_reuse(
         assert resp["location"] == reverse("mfa_authenticate")
         # Note that this bypass only bypasses the actual code check, not the
         # re-use check we're testing here.
-        with totp_validation_bypass():
+        with totp_validation_bypass() as m:
+            m.return_value = counter
             resp = client.post(
                 reverse("mfa_authenticate"),
-                {"code": code},
+                {"code": "123456"},
             )
         if expect_success:
             assert resp.status_code == HTTPStatus.FOUND
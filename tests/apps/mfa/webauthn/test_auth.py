@@ -0,0 +1,109 @@
+import importlib
+from unittest.mock import patch
+
+from fido2.utils import websafe_encode
+
+from allauth.core import context
+from allauth.mfa.models import Authenticator
+from allauth.mfa.webauthn.internal import auth
+
+
+def test_get_authenticator_by_credential_id(user, passkey, user_factory):
+    credential_id = passkey.wrap().credential_data.credential_id
+    with patch("allauth.mfa.webauthn.internal.auth.parse_registration_response") as m:
+        assert auth.get_authenticator_by_credential_id(user, credential_id) == passkey
+        assert (
+            auth.get_authenticator_by_credential_id(user_factory(), credential_id)
+            is None
+        )
+        assert auth.get_authenticator_by_credential_id(user, b"unknown") is None
+        # The stored credential data is used, the credential is not parsed.
+        assert not m.called
+
+
+def test_add_stores_credential_data(user, webauthn_credential_data_factory):
+    credential_data = webauthn_credential_data_factory()
+    with patch("allauth.mfa.webauthn.internal.auth.parse_registration_response") as m:
+        m.return_value.response.attestation_object.auth_data.credential_data = (
+            credential_data
+        )
+        authenticator = auth.WebAuthn.add(user, "Key", {"id": "123"}).instance
+    authenticator = Authenticator.objects.get(pk=authenticator.pk)
+    assert authenticator.credential_id_hash == auth.hash_credential_id(
+        credential_data.credential_id
+    )
+    assert authenticator.data["credential_data"] == websafe_encode(credential_data)
+    assert auth.get_credentials(user) == [credential_data]
+
+
+def test_get_server_is_memoized(rf, settings, db):
+    from django.contrib.sites.models import Site
+
+    settings.ALLOWED_HOSTS = ["example.com", "other.org"]
+    with context.request_context(rf.get("/", HTTP_HOST="example.com")):
+        server = auth.get_server()
+        assert auth.get_server() is server
+        assert server.rp.id == "example.com"
+
+        Site.objects.filter(pk=settings.SITE_ID).update(name="Renamed")
+        Site.objects.clear_cache()
+        renamed_server = auth.get_server()
+        assert renamed_server is not server
+        assert renamed_server.rp.name == "Renamed"
+
+        settings.MFA_WEBAUTHN_ALLOW_INSECURE_ORIGIN = True
+        assert auth.get_server() is not renamed_server
+
+    with context.request_context(rf.get("/", HTTP_HOST="other.org")):
+        assert auth.get_server().rp.id == "other.org"
+
+
+def test_get_authenticator_without_hash(user, passkey):
+    credential_id = passkey.wrap().credential_data.credential_id
+    Authenticator.objects.filter(pk=passkey.pk).update(credential_id_hash=None)
+    assert auth.get_authenticator_by_credential_id(user, credential_id) == passkey
+    passkey.refresh_from_db()
+    assert passkey.credential_id_hash == auth.hash_credential_id(credential_id)
+
+
+def test_migration_stores_credential_id_hash(
+    user, passkey, webauthn_credential_data_factory
+):
+    from django.apps import apps
+
+    from fido2.webauthn import AttestationObject, AuthenticatorData
+
+    migration = importlib.import_module(
+        "allauth.mfa.migrations.0004_authenticator_credential_id_hash"
+    )
+    credential_data = webauthn_credential_data_factory()
+    auth_data = AuthenticatorData.create(
+        b"\0" * 32, AuthenticatorData.FLAG.ATTESTED, 0, credential_data
+    )
+    attestation_object = AttestationObject.create("none", auth_data, {})
+    passkey.credential_id_hash = None
+    passkey.data = {
+        "credential": {
+            "response": {"attestationObject": websafe_encode(attestation_object)}
+        }
+    }
+    passkey.save()
+    duplicate = Authenticator.objects.create(
+        user=user, type=Authenticator.Type.WEBAUTHN, data=passkey.data
+    )
+    unparseable = Authenticator.objects.create(
+        user=user,
+        type=Authenticator.Type.WEBAUTHN,
+        data={"credential": {"response": {"attestationObject": "garbage"}}},
+    )
+    migration.forwards(apps, None)
+    passkey.refresh_from_db()
+    assert passkey.credential_id_hash == auth.hash_credential_id(
+        credential_data.credential_id
+    )
+    assert passkey.data["credential_data"] == websafe_encode(credential_data)
+    # Only the first registration of a credential ID gets the (unique) hash.
+    duplicate.refresh_from_db()
+    assert duplicate.credential_id_hash is None
+    unparseable.refresh_from_db()
+    assert unparseable.credential_id_hash is None
@@ -1,5 +1,6 @@
+import json
 from http import HTTPStatus
-from unittest.mock import ANY
+from unittest.mock import ANY, patch
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
@@ -10,6 +11,7 @@ from pytest_django.asserts import assertTemplateUsed
 
 from allauth.account.authentication import AUTHENTICATION_METHODS_SESSION_KEY
 from allauth.mfa.models import Authenticator
+from allauth.mfa.webauthn.internal import auth
 
 
 def test_passkey_login(client, passkey, webauthn_authentication_bypass):
@@ -82,6 +84,29 @@ def test_invalid_passkey_login(client, passkey):
     assert resp["location"] == reverse("account_login")
 
 
+def test_passkey_login_of_other_user(
+    client, passkey, user_factory, webauthn_authentication_bypass
+):
+    other_user = user_factory()
+    with webauthn_authentication_bypass(passkey) as credential:
+        with webauthn_authentication_bypass(
+            Authenticator(
+                user=other_user, type=Authenticator.Type.WEBAUTHN, data=passkey.data
+            )
+        ) as other_credential:
+            # The credential ID of the passkey, the user handle of another user.
+            credential = json.loads(credential)
+            credential["response"] = json.loads(other_credential)["response"]
+            client.get(
+                reverse("mfa_login_webauthn"), HTTP_X_REQUESTED_WITH="XMLHttpRequest"
+            )
+            resp = client.post(
+                reverse("mfa_login_webauthn"),
+                data={"credential": json.dumps(credential)},
+            )
+    assert resp["location"] == reverse("account_login")
+
+
 def test_rename_key(auth_client, passkey, reauthentication_bypass):
     resp = auth_client.get(reverse("mfa_edit_webauthn", kwargs={"pk": passkey.pk}))
     assert resp["location"].startswith(reverse("account_reauthenticate"))
@@ -146,6 +171,36 @@ def test_add_key(
         ).exists()
 
 
+def test_add_registered_key(
+    auth_client,
+    user,
+    user_factory,
+    webauthn_registration_bypass,
+    webauthn_credential_data_factory,
+    reauthentication_bypass,
+):
+    credential_data = webauthn_credential_data_factory()
+    Authenticator.objects.create(
+        user=user_factory(),
+        type=Authenticator.Type.WEBAUTHN,
+        credential_id_hash=auth.hash_credential_id(credential_data.credential_id),
+        data={"name": "Key", "credential": {}},
+    )
+    with reauthentication_bypass():
+        with webauthn_registration_bypass(user, False) as credential:
+            with patch(
+                "allauth.mfa.webauthn.internal.auth.extract_credential_data",
+                return_value=credential_data,
+            ):
+                resp = auth_client.post(
+                    reverse("mfa_add_webauthn"), data={"credential": credential}
+                )
+    assert resp.status_code == HTTPStatus.OK
+    assert not Authenticator.objects.filter(
+        user=user, type=Authenticator.Type.WEBAUTHN
+    ).exists()
+
+
 def test_list_keys(auth_client):
     resp = auth_client.get(reverse("mfa_list_webauthn"))
     assertTemplateUsed(resp, "mfa/webauthn/authenticator_list.html")
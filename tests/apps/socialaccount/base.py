@@ -6,6 +6,7 @@ import requests
 import uuid
 import warnings
 from http import HTTPStatus
+from unittest.mock import patch
 from urllib.parse import parse_qs, urlparse
 
 from django.conf import settings
@@ -173,13 +174,63 @@ class OAuth2TestsMixin:
             response["refresh_token"] = self.get_refresh_token()
         return json.dumps(response)
 
+    def get_mocked_response_urls(self) -> list[str] | None:
+        """
+        Providers that perform requests concurrently (``fan_out()``) cannot
+        rely on the order of the mocked responses. Return the URLs that the
+        responses of ``get_mocked_response()`` belong to, so that responses
+        are matched by URL instead.
+        """
+        return None
+
+    # Set while matching mocked responses by URL, see
+    # ``test_login_with_concurrent_requests()``.
+    responses_by_url: dict | None = None
+
+    def _mocked_responses_by_url(self, *args, **kwargs):
+        if not self.responses_by_url:
+            return None
+        url = next(arg for arg in args if str(arg).startswith("http"))
+        return self.responses_by_url.get(urlparse(url).path)
+
     def mocked_response(self, *responses):
-        return mocked_response(*responses)
+        return mocked_response(*responses, callback=self._mocked_responses_by_url)
 
     def setUp(self):
         super().setUp()
         self.setup_provider()
 
+    @override_settings(
+        SOCIALACCOUNT_AUTO_SIGNUP=False, SOCIALACCOUNT_REQUESTS_MAX_WORKERS=2
+    )
+    def test_login_with_concurrent_requests(self):
+        from allauth.socialaccount.providers.oauth2 import fanout
+
+        executors = []
+        get_executor = fanout.get_executor
+
+        def spy_get_executor():
+            executor = get_executor()
+            executors.append(executor)
+            return executor
+
+        urls = self.get_mocked_response_urls()
+        if urls is None:
+            return
+        if urls:
+            self.responses_by_url = {
+                urlparse(url).path: response
+                for url, response in zip(urls, self.get_mocked_response())
+            }
+        try:
+            with patch.object(fanout, "get_executor", side_effect=spy_get_executor):
+                resp = self.login(self.get_mocked_response())
+        finally:
+            self.responses_by_url = None
+        self.assertRedirects(resp, reverse("socialaccount_signup"))
+        self.assertTrue(executors)
+        self.assertTrue(all(executors))
+
     def setup_provider(self):
         self.app = setup_app(self.provider_id)
         self.request = RequestFactory().get("/")
@@ -446,6 +497,10 @@ class OpenIDConnectTests(OAuth2TestsMixin):
         # Enable test_login in OAuth2TestsMixin, but this response mock is unused
         return True
 
+    def get_mocked_response_urls(self):
+        # Responses are matched by URL already, see ``_mocked_responses()``.
+        return []
+
     def _mocked_responses(self, url, *args, **kwargs):
         if url.endswith("/.well-known/openid-configuration"):
             return MockedResponse(HTTPStatus.OK, json.dumps(self.oidc_info_content))
@@ -0,0 +1,70 @@
+from django.contrib.sites.models import Site
+from django.core.cache import cache
+
+import pytest
+
+from allauth.socialaccount.adapter import get_adapter
+from allauth.socialaccount.models import SocialApp
+
+
+@pytest.fixture(autouse=True)
+def no_settings_apps(settings):
+    settings.SOCIALACCOUNT_PROVIDERS = {}
+
+
+def test_apps_are_cached(db, rf, django_assert_num_queries):
+    request = rf.get("/")
+    app = SocialApp.objects.create(provider="github", client_id="id")
+    app.sites.add(Site.objects.get_current())
+    adapter = get_adapter()
+    assert [a.pk for a in adapter.list_apps(request)] == [app.pk]
+    with django_assert_num_queries(0):
+        assert adapter.get_app(request, "github").pk == app.pk
+        assert adapter.list_apps(request, provider="github", client_id="other") == []
+
+
+def test_apps_are_indexed(db, settings):
+    settings.SOCIALACCOUNT_PROVIDERS = {
+        "openid_connect": {
+            "APPS": [
+                {"provider_id": "server-a", "client_id": "a"},
+                {"provider_id": "server-b", "client_id": "b"},
+            ]
+        }
+    }
+    adapter = get_adapter()
+    assert len(adapter.list_apps(None, provider="openid_connect")) == 2
+    assert [app.client_id for app in adapter.list_apps(None, provider="server-b")] == [
+        "b"
+    ]
+    assert [app.provider_id for app in adapter.list_apps(None, client_id="a")] == [
+        "server-a"
+    ]
+
+
+def test_changes_invalidate_cache(db, rf):
+    request = rf.get("/")
+    adapter = get_adapter()
+    assert adapter.list_apps(request) == []
+    app = SocialApp.objects.create(provider="github", client_id="id")
+    # Not yet available on the current site.
+    assert adapter.list_apps(request) == []
+    app.sites.add(Site.objects.get_current())
+    assert adapter.get_app(request, "github").client_id == "id"
+    app.client_id = "changed"
+    app.save()
+    assert adapter.get_app(request, "github").client_id == "changed"
+    app.delete()
+    assert adapter.list_apps(request) == []
+
+
+def test_shared_version(db, settings, enable_cache, django_assert_num_queries):
+    settings.SOCIALACCOUNT_APPS_CACHE_ALIAS = "default"
+    adapter = get_adapter()
+    assert adapter.list_apps(None) == []
+    with django_assert_num_queries(0):
+        assert adapter.list_apps(None) == []
+    # Another process, altering the apps, bumps the shared version.
+    SocialApp.objects.bulk_create([SocialApp(provider="github", client_id="id")])
+    cache.set("allauth.socialaccount.apps.version", "other")
+    assert [app.client_id for app in adapter.list_apps(None)] == ["id"]
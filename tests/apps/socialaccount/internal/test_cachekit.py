@@ -0,0 +1,82 @@
+from http import HTTPStatus
+from unittest.mock import patch
+
+import pytest
+
+from allauth.socialaccount.internal import cachekit
+from tests.mocking import MockedResponse, mocked_response
+
+
+URL = "https://provider.org/jwks"
+
+
+def lookup(data, kid):
+    return data.get(kid)
+
+
+@pytest.mark.parametrize(
+    "headers,expected",
+    [
+        ({}, (cachekit.DEFAULT_MAX_AGE, cachekit.STALE_WHILE_REVALIDATE)),
+        ({"Cache-Control": "public, max-age=600"}, (600, 3600)),
+        ({"cache-control": "max-age=60, stale-while-revalidate=30"}, (60, 30)),
+        ({"Cache-Control": "no-store"}, (0, 0)),
+        ({"Expires": "Thu, 01 Jan 1970 00:01:40 GMT"}, (40, 3600)),
+        ({"Cache-Control": "max-age=99999999"}, (cachekit.MAX_MAX_AGE, 3600)),
+    ],
+)
+def test_parse_cache_headers(headers, expected):
+    assert cachekit.parse_cache_headers(headers, 60) == expected
+
+
+def test_document_is_cached():
+    cache = cachekit.DocumentCache()
+    with mocked_response({"a": "key-a"}):
+        document = cache.get(URL)
+    assert document.get_key("a", lookup) == "key-a"
+    assert cache.get(URL) is document
+
+
+def test_unknown_kids_are_not_memoized():
+    cache = cachekit.DocumentCache()
+    with mocked_response({"a": "key-a"}):
+        document = cache.get(URL)
+    for i in range(10):
+        assert document.get_key(f"unknown-{i}", lookup) is None
+    assert document.get_key("a", lookup) == "key-a"
+    assert len(document._keys) == 1
+
+
+def test_unknown_kid_refresh_is_throttled():
+    cache = cachekit.DocumentCache()
+    with mocked_response({"a": "key-a"}):
+        document = cache.get(URL)
+    # Fetched just now, so no point in refreshing.
+    assert cache.get(URL, refresh=True) is document
+    document.fetched_at -= cachekit.MIN_REFRESH_INTERVAL
+    with mocked_response({"a": "key-a", "b": "key-b"}):
+        document = cache.get(URL, refresh=True)
+    assert document.get_key("b", lookup) == "key-b"
+
+
+def test_stale_document_is_revalidated_in_background():
+    cache = cachekit.DocumentCache()
+    with mocked_response(
+        MockedResponse(HTTPStatus.OK, {"a": "key-a"}, {"cache-control": "max-age=0"})
+    ):
+        stale = cache.get(URL)
+    with patch("threading.Thread") as thread:
+        assert cache.get(URL) is stale
+    with mocked_response({"b": "key-b"}):
+        thread.call_args.kwargs["target"]()
+    assert cache.get(URL).get_key("b", lookup) == "key-b"
+
+
+def test_no_store_is_not_served_stale():
+    cache = cachekit.DocumentCache()
+    with mocked_response(
+        MockedResponse(HTTPStatus.OK, {"a": "key-a"}, {"cache-control": "no-store"})
+    ):
+        cache.get(URL)
+    with mocked_response({"b": "key-b"}):
+        assert cache.get(URL).data == {"b": "key-b"}
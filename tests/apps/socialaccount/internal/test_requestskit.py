@@ -0,0 +1,21 @@
+from allauth.socialaccount.adapter import get_adapter
+from allauth.socialaccount.internal import requestskit
+
+
+def test_sessions_share_connection_pool():
+    with get_adapter().get_requests_session() as sess1:
+        adapter = sess1.get_adapter("https://provider.org")
+        adapter.poolmanager.connection_from_url("https://provider.org")
+    # Closing the session must leave the pool intact.
+    assert len(adapter.poolmanager.pools) == 1
+    with get_adapter().get_requests_session() as sess2:
+        assert sess2 is not sess1
+        assert sess2.get_adapter("https://provider.org") is adapter
+
+
+def test_pool_follows_settings(settings):
+    adapter = requestskit.get_http_adapter()
+    settings.SOCIALACCOUNT_REQUESTS_MAX_RETRIES = 3
+    retrying_adapter = requestskit.get_http_adapter()
+    assert retrying_adapter is not adapter
+    assert retrying_adapter.max_retries.total == 3
@@ -7,6 +7,9 @@ from allauth.socialaccount.models import SocialAccount
 from allauth.socialaccount.providers.bitbucket_oauth2.provider import (
     BitbucketOAuth2Provider,
 )
+from allauth.socialaccount.providers.bitbucket_oauth2.views import (
+    BitbucketOAuth2Adapter,
+)
 from tests.apps.socialaccount.base import OAuth2TestsMixin
 from tests.mocking import MockedResponse
 
@@ -85,6 +88,12 @@ class BitbucketOAuth2Tests(OAuth2TestsMixin, TestCase):
         }
     """  # noqa
 
+    def get_mocked_response_urls(self):
+        return [
+            BitbucketOAuth2Adapter.profile_url,
+            BitbucketOAuth2Adapter.emails_url,
+        ]
+
     def get_mocked_response(self):
         return [
             MockedResponse(HTTPStatus.OK, self.response_data),
@@ -6,6 +6,7 @@ from django.test import TestCase
 from allauth.account.models import EmailAddress
 from allauth.socialaccount.models import SocialAccount
 from allauth.socialaccount.providers.github.provider import GitHubProvider
+from allauth.socialaccount.providers.github.views import GitHubOAuth2Adapter
 from tests.apps.socialaccount.base import OAuth2TestsMixin
 from tests.mocking import MockedResponse
 
@@ -13,6 +14,9 @@ from tests.mocking import MockedResponse
 class GitHubTests(OAuth2TestsMixin, TestCase):
     provider_id = GitHubProvider.id
 
+    def get_mocked_response_urls(self):
+        return [GitHubOAuth2Adapter.profile_url, GitHubOAuth2Adapter.emails_url]
+
     def get_mocked_response(self):
         return [
             MockedResponse(
@@ -3,6 +3,7 @@ from http import HTTPStatus
 from django.test import TestCase
 
 from allauth.socialaccount.providers.lichess.provider import LichessProvider
+from allauth.socialaccount.providers.lichess.views import LichessOAuth2Adapter
 from tests.apps.socialaccount.base import OAuth2TestsMixin
 from tests.mocking import MockedResponse
 
@@ -10,6 +11,12 @@ from tests.mocking import MockedResponse
 class LichessTests(OAuth2TestsMixin, TestCase):
     provider_id = LichessProvider.id
 
+    def get_mocked_response_urls(self):
+        return [
+            LichessOAuth2Adapter.profile_url,
+            LichessOAuth2Adapter.email_address_url,
+        ]
+
     def get_mocked_response(self):
         return [
             MockedResponse(
@@ -9,6 +9,7 @@ from allauth.socialaccount.providers.base import ProviderException
 from allauth.socialaccount.providers.linkedin_oauth2.provider import (
     LinkedInOAuth2Provider,
 )
+from allauth.socialaccount.providers.linkedin_oauth2.views import LinkedInOAuth2Adapter
 from tests.apps.socialaccount.base import OAuth2TestsMixin
 from tests.mocking import MockedResponse
 
@@ -16,6 +17,9 @@ from tests.mocking import MockedResponse
 class LinkedInOAuth2Tests(OAuth2TestsMixin, TestCase):
     provider_id = LinkedInOAuth2Provider.id
 
+    def get_mocked_response_urls(self):
+        return [LinkedInOAuth2Adapter.email_url, LinkedInOAuth2Adapter.profile_url]
+
     def get_mocked_response(self):
         return [
             MockedResponse(
@@ -0,0 +1,65 @@
+import threading
+
+import pytest
+
+from allauth.core import context
+from allauth.socialaccount.providers.oauth2.fanout import fan_out, get_executor
+
+
+@pytest.fixture
+def concurrent_requests(settings):
+    settings.SOCIALACCOUNT_REQUESTS_MAX_WORKERS = 2
+
+
+def test_fan_out_is_concurrent(concurrent_requests):
+    barrier = threading.Barrier(2, timeout=5)
+
+    def call(value):
+        # Would time out if the calls were performed one after the other.
+        barrier.wait()
+        return value
+
+    assert fan_out(lambda: call("a"), None, lambda: call("b")) == ["a", None, "b"]
+
+
+def test_fan_out_propagates_context(concurrent_requests, rf):
+    request = rf.get("/")
+    with context.request_context(request):
+        assert fan_out(lambda: context.request, lambda: context.request) == [
+            request,
+            request,
+        ]
+
+
+def test_fan_out_raises(concurrent_requests):
+    def fail():
+        raise ValueError
+
+    with pytest.raises(ValueError):
+        fan_out(lambda: "a", fail)
+
+
+def test_fan_out_nested(settings):
+    settings.SOCIALACCOUNT_REQUESTS_MAX_WORKERS = 1
+    assert fan_out(lambda: "a", lambda: fan_out(lambda: "b", lambda: "c")) == [
+        "a",
+        ["b", "c"],
+    ]
+
+
+def test_fan_out_sequential():
+    calls = []
+    fan_out(lambda: calls.append("a"), lambda: calls.append("b"))
+    assert calls == ["a", "b"]
+
+
+def test_fan_out_does_not_wait_for_busy_pool(settings):
+    settings.SOCIALACCOUNT_REQUESTS_MAX_WORKERS = 1
+    release = threading.Event()
+    # Occupy the only worker.
+    busy = get_executor().submit(release.wait, 5)
+    try:
+        assert fan_out(lambda: "a", lambda: "b", lambda: "c") == ["a", "b", "c"]
+        assert not busy.done()
+    finally:
+        release.set()
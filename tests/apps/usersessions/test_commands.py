@@ -0,0 +1,26 @@
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import Client
+
+from allauth.usersessions.models import UserSession
+
+
+def _login(user) -> UserSession:
+    client = Client()
+    client.force_login(user)
+    return UserSession.objects.create(
+        user=user, session_key=client.session.session_key, ip="127.0.0.1"
+    )
+
+
+def test_purge(db, session_engine, user_factory):
+    alive = _login(user_factory())
+    ended = _login(alive.user)
+    password_changed = _login(user_factory())
+    import_module(settings.SESSION_ENGINE).SessionStore().delete(ended.session_key)
+    password_changed.user.set_password("changed")
+    password_changed.user.save()
+    call_command("usersessions_purge", batch_size=2)
+    assert list(UserSession.objects.all()) == [alive]
@@ -1,10 +1,15 @@
-from unittest.mock import Mock
+import time
+from datetime import timedelta
+from unittest.mock import Mock, patch
 
 from django.contrib.auth.models import AnonymousUser
+from django.core.signals import request_finished
+from django.db.models import F
 from django.test.utils import override_settings
 
 import pytest
 
+from allauth.usersessions.internal import activitykit
 from allauth.usersessions.middleware import UserSessionsMiddleware
 from allauth.usersessions.models import UserSession
 from allauth.usersessions.signals import session_client_changed
@@ -91,3 +96,94 @@ def test_mw_change_ip_and_useragent(rf, db, user):
 
     # Clean up signal connection
     session_client_changed.disconnect(signal_handler)
+
+
+def _request(rf, user, session_key="sess-123"):
+    request = rf.get("/")
+    request.user = user
+    request.session = Mock()
+    request.session.session_key = session_key
+    return request
+
+
+def test_mw_throttles_last_seen_at(rf, db, settings, user, django_assert_num_queries):
+    settings.USERSESSIONS_TRACK_ACTIVITY = True
+    settings.USERSESSIONS_TRACK_ACTIVITY_INTERVAL = 60
+    mw = UserSessionsMiddleware(lambda request: None)
+    mw(_request(rf, user))
+    session = UserSession.objects.get(session_key="sess-123")
+    with django_assert_num_queries(1):
+        mw(_request(rf, user))
+    session.last_seen_at -= timedelta(seconds=60)
+    session.save()
+    mw(_request(rf, user))
+    assert UserSession.objects.get(pk=session.pk).last_seen_at > session.last_seen_at
+
+
+def test_mw_buffers_last_seen_at(rf, db, settings, user):
+    settings.USERSESSIONS_TRACK_ACTIVITY = True
+    settings.USERSESSIONS_TRACK_ACTIVITY_BUFFER_SIZE = 2
+    mw = UserSessionsMiddleware(lambda request: None)
+    for session_key in ["sess-a", "sess-b"]:
+        mw(_request(rf, user, session_key))
+    UserSession.objects.update(last_seen_at=F("last_seen_at") - timedelta(minutes=1))
+    last_seen_at = {
+        session.session_key: session.last_seen_at
+        for session in UserSession.objects.all()
+    }
+    mw(_request(rf, user, "sess-a"))
+    assert UserSession.objects.get(session_key="sess-a").last_seen_at == (
+        last_seen_at["sess-a"]
+    )
+    mw(_request(rf, user, "sess-b"))
+    for session in UserSession.objects.all():
+        assert session.last_seen_at > last_seen_at[session.session_key]
+
+
+def test_pending_last_seen_at_is_flushed(rf, db, settings, user):
+    settings.USERSESSIONS_TRACK_ACTIVITY = True
+    settings.USERSESSIONS_TRACK_ACTIVITY_BUFFER_SIZE = 10
+    mw = UserSessionsMiddleware(lambda request: None)
+    mw(_request(rf, user))
+    UserSession.objects.update(last_seen_at=F("last_seen_at") - timedelta(minutes=1))
+    last_seen_at = UserSession.objects.get().last_seen_at
+    mw(_request(rf, user))
+    request_finished.send(sender=None)
+    assert UserSession.objects.get().last_seen_at == last_seen_at
+    now = time.monotonic() + 60
+    with patch("allauth.usersessions.internal.activitykit.time.monotonic") as m:
+        m.return_value = now
+        request_finished.send(sender=None)
+    assert UserSession.objects.get().last_seen_at > last_seen_at
+
+
+def test_pending_last_seen_at_is_flushed_at_exit(rf, db, settings, user):
+    settings.USERSESSIONS_TRACK_ACTIVITY = True
+    settings.USERSESSIONS_TRACK_ACTIVITY_BUFFER_SIZE = 10
+    mw = UserSessionsMiddleware(lambda request: None)
+    mw(_request(rf, user))
+    UserSession.objects.update(last_seen_at=F("last_seen_at") - timedelta(minutes=1))
+    last_seen_at = UserSession.objects.get().last_seen_at
+    mw(_request(rf, user))
+    activitykit.flush_at_exit()
+    assert UserSession.objects.get().last_seen_at > last_seen_at
+
+
+def test_mw_seen_recently(
+    rf, db, settings, user, enable_cache, django_assert_num_queries
+):
+    settings.USERSESSIONS_TRACK_ACTIVITY = True
+    mw = UserSessionsMiddleware(lambda request: None)
+    mw(_request(rf, user))
+    with django_assert_num_queries(0):
+        mw(_request(rf, user))
+    # A change of client is still picked up right away.
+    request = _request(rf, user)
+    request.META["REMOTE_ADDR"] = "2.2.2.2"
+    mw(request)
+    session = UserSession.objects.get(session_key="sess-123")
+    assert session.ip == "2.2.2.2"
+    # Ended sessions are forgotten.
+    session.delete()
+    mw(request)
+    assert UserSession.objects.filter(session_key="sess-123").exists()
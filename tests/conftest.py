@@ -8,7 +8,7 @@ import time
 import uuid
 from contextlib import contextmanager
 from pathlib import Path
-from unittest.mock import Mock, PropertyMock, patch
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
 from django.contrib.messages.middleware import MessageMiddleware
@@ -144,6 +144,19 @@ def reauthentication_bypass():
     return f
 
 
+@pytest.fixture
+def webauthn_credential_data_factory():
+    def f(credential_id=None):
+        from fido2.webauthn import AttestedCredentialData
+
+        if credential_id is None:
+            credential_id = uuid.uuid4().bytes
+        public_key = {1: 2, 3: -7, -1: 1, -2: b"x" * 32, -3: b"y" * 32}
+        return AttestedCredentialData.create(b"\0" * 16, credential_id, public_key)
+
+    return f
+
+
 @pytest.fixture
 def webauthn_authentication_bypass():
     @contextmanager
@@ -152,46 +165,39 @@ def webauthn_authentication_bypass():
 
         from allauth.mfa.adapter import get_adapter
 
-        with patch(
-            "allauth.mfa.webauthn.internal.auth.WebAuthn.authenticator_data",
-            new_callable=PropertyMock,
-        ) as ad_m:
-            with patch("fido2.server.Fido2Server.authenticate_begin") as ab_m:
-                ab_m.return_value = ({}, {"state": "dummy"})
-                with patch("fido2.server.Fido2Server.authenticate_complete") as ac_m:
-                    with patch(
-                        "allauth.mfa.webauthn.internal.auth.parse_authentication_response"
-                    ) as m:
-                        user_handle = (
-                            get_adapter().get_public_key_credential_user_entity(
-                                authenticator.user
-                            )["id"]
-                        )
-                        authenticator_data = Mock()
-                        authenticator_data.credential_data.credential_id = (
-                            "credential_id"
-                        )
-                        ad_m.return_value = authenticator_data
-                        m.return_value = Mock()
-                        binding = Mock()
-                        binding.credential_id = "credential_id"
-                        ac_m.return_value = binding
-                        yield json.dumps(
-                            {"response": {"userHandle": websafe_encode(user_handle)}}
-                        )
+        credential_id = authenticator.wrap().credential_data.credential_id
+        user_handle = get_adapter().get_public_key_credential_user_entity(
+            authenticator.user
+        )["id"]
+        with patch("fido2.server.Fido2Server.authenticate_begin") as ab_m:
+            ab_m.return_value = ({}, {"state": "dummy"})
+            with patch("fido2.server.Fido2Server.authenticate_complete"):
+                with patch(
+                    "allauth.mfa.webauthn.internal.auth.parse_authentication_response"
+                ) as m:
+                    m.return_value.raw_id = credential_id
+                    yield json.dumps(
+                        {
+                            "id": websafe_encode(credential_id),
+                            "rawId": websafe_encode(credential_id),
+                            "response": {"userHandle": websafe_encode(user_handle)},
+                        }
+                    )
 
     return f
 
 
 @pytest.fixture
-def webauthn_registration_bypass():
+def webauthn_registration_bypass(webauthn_credential_data_factory):
     @contextmanager
     def f(user, passwordless):
         with patch("fido2.server.Fido2Server.register_complete") as rc_m:
             with patch(
                 "allauth.mfa.webauthn.internal.auth.parse_registration_response"
             ) as m:
-                m.return_value = Mock()
+                m.return_value.response.attestation_object.auth_data.credential_data = (
+                    webauthn_credential_data_factory()
+                )
 
                 class FakeAuthenticatorData(bytes):
                     def is_user_verified(self):
@@ -235,13 +241,29 @@ def enable_cache(settings):
     yield
 
 
+@pytest.fixture(
+    params=[
+        "django.contrib.sessions.backends.db",
+        "django.contrib.sessions.backends.cache",
+        "django.contrib.sessions.backends.cached_db",
+        "django.contrib.sessions.backends.file",
+    ]
+)
+def session_engine(request, settings, enable_cache, tmp_path):
+    settings.SESSION_ENGINE = request.param
+    settings.SESSION_FILE_PATH = str(tmp_path)
+    return request.param
+
+
 @pytest.fixture
 def totp_validation_bypass():
     @contextmanager
     def f():
-        with patch("allauth.mfa.totp.internal.auth.validate_totp_code") as m:
-            m.return_value = True
-            yield
+        from allauth.mfa.totp.internal.auth import yield_hotp_counters_from_time
+
+        with patch("allauth.mfa.totp.internal.auth.match_totp_code") as m:
+            m.return_value = next(yield_hotp_counters_from_time())
+            yield m
 
     return f
 
@@ -301,16 +323,22 @@ def user_with_recovery_codes(user_with_totp):
 
 
 @pytest.fixture
-def passkey(user):
+def passkey(user, webauthn_credential_data_factory):
+    from fido2.utils import websafe_encode
+
     from allauth.mfa.models import Authenticator
+    from allauth.mfa.webauthn.internal.auth import hash_credential_id
 
+    credential_data = webauthn_credential_data_factory()
     authenticator = Authenticator.objects.create(
         user=user,
         type=Authenticator.Type.WEBAUTHN,
+        credential_id_hash=hash_credential_id(credential_data.credential_id),
         data={
             "name": "Test passkey",
             "passwordless": True,
             "credential": {},
+            "credential_data": websafe_encode(credential_data),
         },
     )
     return authenticator
@@ -437,6 +465,28 @@ def settings_impacting_urls(settings):
     return f
 
 
+@pytest.fixture(autouse=True)
+def clear_provider_documents():
+    from allauth.socialaccount.internal import cachekit
+
+    yield
+    cachekit.documents.clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_social_apps():
+    from allauth.socialaccount.internal import appkit
+
+    yield
+    appkit.invalidate()
+
+
+@pytest.fixture(autouse=True)
+def sequential_provider_requests(settings):
+    # Mocked responses are handed out in order, so the requests must be too.
+    settings.SOCIALACCOUNT_REQUESTS_MAX_WORKERS = 0
+
+
 @pytest.fixture(autouse=True)
 def clear_phone_stub():
     from tests.projects.common import phone_stub